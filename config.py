@@ -21,6 +21,11 @@ DATABASE_PATH = Path(os.getenv(
 # Room settings
 ROOM_CLEANUP_HOURS = int(os.getenv("BERRYPOKER_ROOM_CLEANUP_HOURS", "24"))
 ROOM_PERSIST_INTERVAL_SECONDS = int(os.getenv("BERRYPOKER_PERSIST_INTERVAL", "30"))
+# Rooms changed by player actions are written at most this often
+ROOM_FLUSH_INTERVAL_MS = int(os.getenv("BERRYPOKER_FLUSH_INTERVAL_MS", "200"))
+
+# WebSocket settings - messages a client may fall behind before it is disconnected
+WS_OUTBOX_SIZE = int(os.getenv("BERRYPOKER_WS_OUTBOX_SIZE", "256"))
 
 # Production mode
 PRODUCTION = os.getenv("BERRYPOKER_PRODUCTION", "false").lower() == "true"
@@ -1,4 +1,4 @@
-from .db import init_db, get_db
+from .db import init_db, get_db, close_db
 from .history import HistoryManager
 
-__all__ = ['init_db', 'get_db', 'HistoryManager']
+__all__ = ['init_db', 'get_db', 'close_db', 'HistoryManager']
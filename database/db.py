@@ -1,9 +1,12 @@
 """Database connection and initialization."""
 
+import atexit
+import json
 import sqlite3
+import warnings
 from pathlib import Path
-from contextlib import contextmanager
-from typing import Generator
+from contextlib import contextmanager, nullcontext
+from typing import ContextManager, Generator, List
 import threading
 
 # Import config, with fallback for tests
@@ -15,85 +18,206 @@ except ImportError:
 # Thread-local storage for connections
 _local = threading.local()
 
-# Database lock for write operations
+# Every pooled connection, so they can all be closed on shutdown
+_pool: List[sqlite3.Connection] = []
+_pool_lock = threading.Lock()
+_pool_generation = 0
+
+# Serializes schema creation; SQLite (WAL) serializes ordinary writes itself
 _db_lock = threading.Lock()
 
 
-def init_db():
-    """Initialize the database with required tables."""
-    with _db_lock:
-        conn = sqlite3.connect(DATABASE_PATH)
-        cursor = conn.cursor()
-
-        # Hands table - records each hand played
+# Hands table - records each hand played
+_HANDS_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS hands (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        room_id TEXT NOT NULL,
+        hand_number INTEGER NOT NULL,
+        pot_size INTEGER NOT NULL,
+        data_json TEXT NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+'''
+
+# The rest of the schema, run as one script so it is compiled in one call
+_SCHEMA = '''
+    -- Player stats table
+    CREATE TABLE IF NOT EXISTS player_stats (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        player_name TEXT UNIQUE NOT NULL,
+        hands_played INTEGER DEFAULT 0,
+        hands_won INTEGER DEFAULT 0,
+        total_profit INTEGER DEFAULT 0
+    );
+
+    -- Player hand results - detailed per-player per-hand results
+    CREATE TABLE IF NOT EXISTS player_hand_results (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        hand_id INTEGER NOT NULL,
+        player_name TEXT NOT NULL,
+        starting_stack INTEGER NOT NULL,
+        ending_stack INTEGER NOT NULL,
+        profit INTEGER NOT NULL,
+        is_winner BOOLEAN NOT NULL,
+        hole_cards TEXT,
+        FOREIGN KEY (hand_id) REFERENCES hands(id)
+    );
+
+    -- Room state table - persists active rooms
+    CREATE TABLE IF NOT EXISTS rooms (
+        room_id TEXT PRIMARY KEY,
+        state_json TEXT NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+
+    -- Index for faster room lookups
+    CREATE INDEX IF NOT EXISTS idx_rooms_updated_at ON rooms(updated_at);
+
+    -- Indexes for the history and leaderboard queries
+    CREATE INDEX IF NOT EXISTS idx_hands_room_created ON hands(room_id, created_at DESC);
+    CREATE INDEX IF NOT EXISTS idx_hands_winners ON hands(json_extract(data_json, '$.winners'));
+    CREATE INDEX IF NOT EXISTS idx_phr_hand ON player_hand_results(hand_id);
+    CREATE INDEX IF NOT EXISTS idx_phr_player ON player_hand_results(player_name);
+    CREATE INDEX IF NOT EXISTS idx_stats_profit ON player_stats(total_profit DESC);
+
+    -- Refresh planner statistics so the indexes above get used
+    ANALYZE;
+'''
+
+
+def _apply_pragmas(conn: sqlite3.Connection):
+    """Apply performance PRAGMAs to a new connection."""
+    # WAL lets readers proceed while a hand is being recorded; it has no
+    # meaning for in-memory databases
+    if str(DATABASE_PATH) != ':memory:':
+        conn.execute('PRAGMA journal_mode=WAL')
+    # NORMAL is durable in WAL mode and avoids an fsync per commit
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.execute('PRAGMA temp_store=MEMORY')
+    conn.execute('PRAGMA mmap_size=268435456')
+    conn.execute('PRAGMA cache_size=-64000')
+
+
+def _migrate_hands_data_json(cursor: sqlite3.Cursor):
+    """Fold the legacy winner_names/actions columns of hands into data_json."""
+    columns = {row[1] for row in cursor.execute('PRAGMA table_info(hands)')}
+    if 'winner_names' not in columns:
+        return
+
+    # One explicit transaction, so a failed migration leaves the legacy
+    # table as it was instead of an orphaned hands_migrated
+    cursor.execute('BEGIN')
+    try:
         cursor.execute('''
-            CREATE TABLE IF NOT EXISTS hands (
+            CREATE TABLE hands_migrated (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 room_id TEXT NOT NULL,
                 hand_number INTEGER NOT NULL,
                 pot_size INTEGER NOT NULL,
-                winner_names TEXT NOT NULL,
-                actions TEXT NOT NULL,
+                data_json TEXT NOT NULL,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         ''')
+        rows = cursor.execute('''
+            SELECT id, room_id, hand_number, pot_size, winner_names, actions, created_at
+            FROM hands
+        ''').fetchall()
+        cursor.executemany('''
+            INSERT INTO hands_migrated (id, room_id, hand_number, pot_size, data_json, created_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', [
+            (hand_id, room_id, hand_number, pot_size,
+             json.dumps({'winners': winner_names.split(',') if winner_names else [],
+                         'actions': json.loads(actions)}),
+             created_at)
+            for hand_id, room_id, hand_number, pot_size, winner_names, actions, created_at in rows
+        ])
+        cursor.execute('DROP TABLE hands')
+        cursor.execute('ALTER TABLE hands_migrated RENAME TO hands')
+    except Exception:
+        cursor.connection.rollback()
+        raise
+    cursor.connection.commit()
 
-        # Player stats table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS player_stats (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                player_name TEXT UNIQUE NOT NULL,
-                hands_played INTEGER DEFAULT 0,
-                hands_won INTEGER DEFAULT 0,
-                total_profit INTEGER DEFAULT 0
-            )
-        ''')
-
-        # Player hand results - detailed per-player per-hand results
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS player_hand_results (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                hand_id INTEGER NOT NULL,
-                player_name TEXT NOT NULL,
-                starting_stack INTEGER NOT NULL,
-                ending_stack INTEGER NOT NULL,
-                profit INTEGER NOT NULL,
-                is_winner BOOLEAN NOT NULL,
-                hole_cards TEXT,
-                FOREIGN KEY (hand_id) REFERENCES hands(id)
-            )
-        ''')
 
-        # Room state table - persists active rooms
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS rooms (
-                room_id TEXT PRIMARY KEY,
-                state_json TEXT NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-
-        # Create index for faster room lookups
-        cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_rooms_updated_at ON rooms(updated_at)
-        ''')
-
-        conn.commit()
-        conn.close()
+def init_db():
+    """Initialize the database with required tables."""
+    with _db_lock:
+        conn = sqlite3.connect(DATABASE_PATH)
+        try:
+            _apply_pragmas(conn)
+            cursor = conn.cursor()
+
+            # hands is created and migrated first: idx_hands_winners needs its
+            # data_json column, which legacy databases do not have yet
+            cursor.executescript(_HANDS_SCHEMA)
+            _migrate_hands_data_json(cursor)
+            cursor.executescript(_SCHEMA)
+
+            conn.commit()
+        finally:
+            conn.close()
+
+
+def _connect() -> sqlite3.Connection:
+    """Open a new pooled connection for the current thread."""
+    # Connections never leave the thread that opened them; check_same_thread
+    # is disabled only so close_db can close them from the shutdown thread
+    # Pooled connections live long, so a larger statement cache keeps every
+    # (constant) query string in the app compiled after its first use
+    conn = sqlite3.connect(DATABASE_PATH, check_same_thread=False, cached_statements=256)
+    conn.row_factory = sqlite3.Row
+    _apply_pragmas(conn)
+    with _pool_lock:
+        _pool.append(conn)
+    return conn
 
 
 @contextmanager
 def get_db() -> Generator[sqlite3.Connection, None, None]:
-    """Get a database connection."""
-    conn = sqlite3.connect(DATABASE_PATH)
-    conn.row_factory = sqlite3.Row
+    """Get this thread's pooled database connection.
+
+    The connection stays open for the life of the thread (or until
+    close_db), so repeated queries reuse SQLite's page cache instead of
+    reopening the database files.
+    """
+    key = (DATABASE_PATH, _pool_generation)
+    conn = getattr(_local, 'conn', None)
+    if conn is None or _local.key != key:
+        conn = _connect()
+        _local.conn = conn
+        _local.key = key
+
     try:
         yield conn
-    finally:
-        conn.close()
+    except Exception:
+        conn.rollback()
+        raise
+
+
+def close_db():
+    """Close every pooled connection."""
+    global _pool_generation
+    with _pool_lock:
+        for conn in _pool:
+            conn.close()
+        _pool.clear()
+        _pool_generation += 1
+
+
+atexit.register(close_db)
+
 
+def get_db_lock() -> ContextManager[None]:
+    """Deprecated: writes no longer need an application-level lock.
 
-def get_db_lock() -> threading.Lock:
-    """Get the database write lock."""
-    return _db_lock
+    SQLite serializes writers itself, so this returns a no-op context
+    manager for existing callers.
+    """
+    warnings.warn(
+        "get_db_lock() is deprecated; SQLite serializes writes itself",
+        DeprecationWarning,
+        stacklevel=2
+    )
+    return nullcontext()
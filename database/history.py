@@ -23,67 +23,122 @@ class HistoryManager:
             - is_winner
             - hole_cards (optional)
         """
-        with get_db() as conn:
-            cursor = conn.cursor()
+        return HistoryManager.record_hands([{
+            'room_id': room_id,
+            'hand_number': hand_number,
+            'pot_size': pot_size,
+            'winners': winners,
+            'actions': actions,
+            'player_results': player_results
+        }])[0]
 
-            # Insert hand record
-            cursor.execute('''
-                INSERT INTO hands (room_id, hand_number, pot_size, winner_names, actions)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (room_id, hand_number, pot_size, ','.join(winners), json.dumps(actions)))
+    @staticmethod
+    def record_hands(hands: List[Dict[str, Any]]) -> List[int]:
+        """
+        Record several completed hands in one transaction.
 
-            hand_id = cursor.lastrowid
+        Each hand is a dict of record_hand's arguments. Returns the hand IDs
+        in the same order.
+        """
+        hand_ids = []
+        with get_db() as conn, conn:
+            cursor = conn.cursor()
+            for hand in hands:
+                hand_ids.append(HistoryManager._insert_hand(cursor, **hand))
+        return hand_ids
 
-            # Insert player results
-            for result in player_results:
-                cursor.execute('''
-                    INSERT INTO player_hand_results
-                    (hand_id, player_name, starting_stack, ending_stack, profit, is_winner, hole_cards)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    hand_id,
-                    result['player_name'],
-                    result['starting_stack'],
-                    result['ending_stack'],
-                    result['profit'],
-                    result['is_winner'],
-                    json.dumps(result.get('hole_cards', []))
-                ))
-
-                # Update player stats
-                cursor.execute('''
-                    INSERT INTO player_stats (player_name, hands_played, hands_won, total_profit)
-                    VALUES (?, 1, ?, ?)
-                    ON CONFLICT(player_name) DO UPDATE SET
-                        hands_played = hands_played + 1,
-                        hands_won = hands_won + ?,
-                        total_profit = total_profit + ?
-                ''', (
-                    result['player_name'],
-                    1 if result['is_winner'] else 0,
-                    result['profit'],
-                    1 if result['is_winner'] else 0,
-                    result['profit']
-                ))
-
-            conn.commit()
-            return hand_id
+    @staticmethod
+    def _insert_hand(cursor, room_id: str, hand_number: int, pot_size: int,
+                     winners: List[str], actions: List[Dict],
+                     player_results: List[Dict[str, Any]]) -> int:
+        # Insert hand record
+        cursor.execute('''
+            INSERT INTO hands (room_id, hand_number, pot_size, data_json)
+            VALUES (?, ?, ?, ?)
+        ''', (room_id, hand_number, pot_size,
+              json.dumps({'winners': winners, 'actions': actions})))
+
+        hand_id = cursor.lastrowid
+
+        results_rows = []
+        stats_rows = []
+        for result in player_results:
+            results_rows.append((
+                hand_id,
+                result['player_name'],
+                result['starting_stack'],
+                result['ending_stack'],
+                result['profit'],
+                result['is_winner'],
+                json.dumps(result.get('hole_cards', []))
+            ))
+            stats_rows.append({
+                'n': result['player_name'],
+                'w': 1 if result['is_winner'] else 0,
+                'p': result['profit']
+            })
+
+        # Insert player results
+        cursor.executemany('''
+            INSERT INTO player_hand_results
+            (hand_id, player_name, starting_stack, ending_stack, profit, is_winner, hole_cards)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', results_rows)
+
+        # Update player stats in one statement over a JSON array of rows
+        # (WHERE true disambiguates the upsert from a join's ON clause)
+        cursor.execute('''
+            INSERT INTO player_stats (player_name, hands_played, hands_won, total_profit)
+            SELECT json_extract(value, '$.n'), 1,
+                   json_extract(value, '$.w'), json_extract(value, '$.p')
+            FROM json_each(?) WHERE true
+            ON CONFLICT(player_name) DO UPDATE SET
+                hands_played = hands_played + 1,
+                hands_won = hands_won + excluded.hands_won,
+                total_profit = total_profit + excluded.total_profit
+        ''', (json.dumps(stats_rows),))
+
+        return hand_id
 
     @staticmethod
-    def get_hand_history(room_id: str, limit: int = 50) -> List[Dict]:
-        """Get recent hand history for a room."""
+    def get_hand_history(room_id: str, limit: int = 50,
+                         include_actions: bool = False) -> List[Dict]:
+        """
+        Get recent hand history for a room.
+
+        The (potentially large) actions log is only decoded and returned
+        when include_actions is set; otherwise just the winners are pulled
+        out of the hand's JSON data.
+        """
         with get_db() as conn:
             cursor = conn.cursor()
-            cursor.execute('''
-                SELECT id, room_id, hand_number, pot_size, winner_names, actions, created_at
-                FROM hands
-                WHERE room_id = ?
-                ORDER BY created_at DESC
-                LIMIT ?
-            ''', (room_id, limit))
-
-            rows = cursor.fetchall()
-            return [dict(row) for row in rows]
+            if include_actions:
+                cursor.execute('''
+                    SELECT id, room_id, hand_number, pot_size, data_json, created_at
+                    FROM hands
+                    WHERE room_id = ?
+                    ORDER BY created_at DESC
+                    LIMIT ?
+                ''', (room_id, limit))
+            else:
+                cursor.execute('''
+                    SELECT id, room_id, hand_number, pot_size,
+                           json_extract(data_json, '$.winners') AS winners, created_at
+                    FROM hands
+                    WHERE room_id = ?
+                    ORDER BY created_at DESC
+                    LIMIT ?
+                ''', (room_id, limit))
+
+            history = []
+            for row in cursor.fetchall():
+                hand = dict(row)
+                if include_actions:
+                    hand.update(json.loads(hand.pop('data_json')))
+                else:
+                    hand['winners'] = json.loads(hand['winners'])
+                history.append(hand)
+            return history
 
     @staticmethod
     def get_hand_details(hand_id: int) -> Optional[Dict]:
@@ -93,7 +148,7 @@ class HistoryManager:
 
             # Get hand info
             cursor.execute('''
-                SELECT id, room_id, hand_number, pot_size, winner_names, actions, created_at
+                SELECT id, room_id, hand_number, pot_size, data_json, created_at
                 FROM hands WHERE id = ?
             ''', (hand_id,))
             hand = cursor.fetchone()
@@ -102,7 +157,7 @@ class HistoryManager:
                 return None
 
             result = dict(hand)
-            result['actions'] = json.loads(result['actions'])
+            result.update(json.loads(result.pop('data_json')))
 
             # Get player results
             cursor.execute('''
@@ -1,8 +1,7 @@
 """Hand evaluation for Texas Hold'em poker."""
 
-from collections import Counter
-from itertools import combinations
-from typing import List, Tuple
+from functools import lru_cache
+from typing import List, Optional, Tuple
 from .poker import Card
 
 
@@ -32,6 +31,45 @@ class HandRank:
     }
 
 
+# The ten straights as 13-bit rank masks with their high card, best first
+# (the wheel, A-2-3-4-5, is last and plays five high)
+STRAIGHT_MASKS = [(0b1111100000000 >> i, 14 - i) for i in range(9)] + [(0b1000000001111, 5)]
+
+
+def _build_straight_table() -> List[int]:
+    """Map every 13-bit rank mask to its highest straight value (0 if none)."""
+    table = [0] * 8192
+    for mask in range(8192):
+        for straight, high in STRAIGHT_MASKS:
+            if mask & straight == straight:
+                table[mask] = high
+                break
+    return table
+
+
+def _build_top_ranks_table() -> List[Tuple[int, ...]]:
+    """Map every 13-bit rank mask to its card values, highest first."""
+    return [
+        tuple(r + 2 for r in range(12, -1, -1) if mask >> r & 1)
+        for mask in range(8192)
+    ]
+
+
+# Lookup tables keyed by a 13-bit rank mask (bit 0 = deuce, bit 12 = ace)
+STRAIGHT_TABLE = _build_straight_table()
+TOP_RANKS_TABLE = _build_top_ranks_table()
+
+# How many cards each tiebreaker value contributes to the best five
+_GROUP_SIZES = {
+    HandRank.HIGH_CARD: (1, 1, 1, 1, 1),
+    HandRank.PAIR: (2, 1, 1, 1),
+    HandRank.TWO_PAIR: (2, 2, 1),
+    HandRank.THREE_OF_A_KIND: (3, 1, 1),
+    HandRank.FULL_HOUSE: (3, 2),
+    HandRank.FOUR_OF_A_KIND: (4, 1),
+}
+
+
 class HandEvaluator:
     """Evaluates poker hands and determines winners."""
 
@@ -44,76 +82,32 @@ class HandEvaluator:
         if len(cards) != 5:
             raise ValueError("Hand must contain exactly 5 cards")
 
-        values = sorted([c.value for c in cards], reverse=True)
-        suits = [c.suit for c in cards]
-        value_counts = Counter(values)
-
-        is_flush = len(set(suits)) == 1
-        is_straight, straight_high = HandEvaluator._check_straight(values)
-
-        # Check for straight flush / royal flush
-        if is_flush and is_straight:
-            if straight_high == 14:
-                return (HandRank.ROYAL_FLUSH, [14], "Royal Flush")
-            return (HandRank.STRAIGHT_FLUSH, [straight_high], f"Straight Flush, {HandEvaluator._value_name(straight_high)} high")
-
-        # Four of a kind
-        if 4 in value_counts.values():
-            quad = [v for v, c in value_counts.items() if c == 4][0]
-            kicker = [v for v, c in value_counts.items() if c == 1][0]
-            return (HandRank.FOUR_OF_A_KIND, [quad, kicker], f"Four of a Kind, {HandEvaluator._value_name(quad)}s")
-
-        # Full house
-        if 3 in value_counts.values() and 2 in value_counts.values():
-            trips = [v for v, c in value_counts.items() if c == 3][0]
-            pair = [v for v, c in value_counts.items() if c == 2][0]
-            return (HandRank.FULL_HOUSE, [trips, pair], f"Full House, {HandEvaluator._value_name(trips)}s full of {HandEvaluator._value_name(pair)}s")
-
-        # Flush
-        if is_flush:
-            return (HandRank.FLUSH, values, f"Flush, {HandEvaluator._value_name(values[0])} high")
-
-        # Straight
-        if is_straight:
-            return (HandRank.STRAIGHT, [straight_high], f"Straight, {HandEvaluator._value_name(straight_high)} high")
-
-        # Three of a kind
-        if 3 in value_counts.values():
-            trips = [v for v, c in value_counts.items() if c == 3][0]
-            kickers = sorted([v for v, c in value_counts.items() if c == 1], reverse=True)
-            return (HandRank.THREE_OF_A_KIND, [trips] + kickers, f"Three of a Kind, {HandEvaluator._value_name(trips)}s")
-
-        # Two pair
-        if list(value_counts.values()).count(2) == 2:
-            pairs = sorted([v for v, c in value_counts.items() if c == 2], reverse=True)
-            kicker = [v for v, c in value_counts.items() if c == 1][0]
-            return (HandRank.TWO_PAIR, pairs + [kicker], f"Two Pair, {HandEvaluator._value_name(pairs[0])}s and {HandEvaluator._value_name(pairs[1])}s")
-
-        # One pair
-        if 2 in value_counts.values():
-            pair = [v for v, c in value_counts.items() if c == 2][0]
-            kickers = sorted([v for v, c in value_counts.items() if c == 1], reverse=True)
-            return (HandRank.PAIR, [pair] + kickers, f"Pair of {HandEvaluator._value_name(pair)}s")
-
-        # High card
-        return (HandRank.HIGH_CARD, values, f"High Card, {HandEvaluator._value_name(values[0])}")
+        rank, tiebreakers, _ = HandEvaluator._rank_cards(cards)
+        return rank, tiebreakers, HandEvaluator._describe(rank, tiebreakers)
 
     @staticmethod
-    def _check_straight(values: List[int]) -> Tuple[bool, int]:
-        """Check if values form a straight. Returns (is_straight, high_card)."""
-        sorted_vals = sorted(set(values), reverse=True)
-        if len(sorted_vals) != 5:
-            return False, 0
-
-        # Regular straight
-        if sorted_vals[0] - sorted_vals[4] == 4:
-            return True, sorted_vals[0]
-
-        # Ace-low straight (A-2-3-4-5)
-        if sorted_vals == [14, 5, 4, 3, 2]:
-            return True, 5
-
-        return False, 0
+    def _describe(rank: int, tiebreakers: List[int]) -> str:
+        """Build the human-readable description of an evaluated hand."""
+        name = HandEvaluator._value_name
+        if rank == HandRank.ROYAL_FLUSH:
+            return "Royal Flush"
+        if rank == HandRank.STRAIGHT_FLUSH:
+            return f"Straight Flush, {name(tiebreakers[0])} high"
+        if rank == HandRank.FOUR_OF_A_KIND:
+            return f"Four of a Kind, {name(tiebreakers[0])}s"
+        if rank == HandRank.FULL_HOUSE:
+            return f"Full House, {name(tiebreakers[0])}s full of {name(tiebreakers[1])}s"
+        if rank == HandRank.FLUSH:
+            return f"Flush, {name(tiebreakers[0])} high"
+        if rank == HandRank.STRAIGHT:
+            return f"Straight, {name(tiebreakers[0])} high"
+        if rank == HandRank.THREE_OF_A_KIND:
+            return f"Three of a Kind, {name(tiebreakers[0])}s"
+        if rank == HandRank.TWO_PAIR:
+            return f"Two Pair, {name(tiebreakers[0])}s and {name(tiebreakers[1])}s"
+        if rank == HandRank.PAIR:
+            return f"Pair of {name(tiebreakers[0])}s"
+        return f"High Card, {name(tiebreakers[0])}"
 
     @staticmethod
     def _value_name(value: int) -> str:
@@ -122,28 +116,182 @@ class HandEvaluator:
         return names.get(value, str(value))
 
     @staticmethod
-    def best_hand(hole_cards: List[Card], community_cards: List[Card]) -> Tuple[List[Card], int, List[int], str]:
+    def eval7(cards: List[Card]) -> int:
+        """
+        Evaluate the best 5-card hand within 5-7 cards as a single integer.
+        Higher is better; equal scores are exact ties.
+        """
+        rank, tiebreakers, _ = HandEvaluator._rank_cards(cards)
+        return HandEvaluator.score(rank, tiebreakers)
+
+    @staticmethod
+    def eval7_batch(hands: List[List[Card]]) -> List[int]:
+        """Score many 5-7 card hands at once; see eval7."""
+        rank_cards = HandEvaluator._rank_cards
+        score = HandEvaluator.score
+        results = []
+        for cards in hands:
+            rank, tiebreakers, _ = rank_cards(cards)
+            results.append(score(rank, tiebreakers))
+        return results
+
+    @staticmethod
+    def score(rank: int, tiebreakers: List[int]) -> int:
+        """Pack a (rank, tiebreakers) pair into one comparable integer.
+
+        Higher is better; equal scores are exact ties.
+        """
+        score = rank
+        for v in tiebreakers:
+            score = score << 4 | v
+        return score << 4 * (5 - len(tiebreakers))
+
+    @staticmethod
+    def _rank_cards(cards: List[Card], key: Optional[int] = None) -> Tuple[int, List[int], int]:
+        """Rank the best hand within 5-7 cards.
+
+        key may be passed when the caller already has the card-set key.
+        Returns: (rank, tiebreakers, flush_suit_index or -1)
+        """
+        if not 5 <= len(cards) <= 7:
+            raise ValueError("Need 5 to 7 cards to evaluate")
+
+        # The set of cards alone determines the result, so a 52-bit mask of
+        # card codes is an order-independent cache key
+        if key is None:
+            key = HandEvaluator._card_set_key(cards)
+        if key.bit_count() == len(cards):
+            rank, tiebreakers, flush_suit = HandEvaluator._rank_card_set(key)
+        else:
+            # Duplicate cards can't be expressed as a set; rank them directly
+            rank, tiebreakers, flush_suit = HandEvaluator._rank_codes([c.code for c in cards])
+        return rank, list(tiebreakers), flush_suit
+
+    @staticmethod
+    def _card_set_key(cards: List[Card]) -> int:
+        """52-bit mask with one bit set per card code."""
+        key = 0
+        for c in cards:
+            key |= 1 << c.code
+        return key
+
+    @staticmethod
+    @lru_cache(maxsize=1 << 16)
+    def _rank_card_set(key: int) -> Tuple[int, Tuple[int, ...], int]:
+        """Cached ranking of the cards whose codes are the set bits of key."""
+        codes = []
+        while key:
+            low = key & -key
+            codes.append(low.bit_length() - 1)
+            key ^= low
+        rank, tiebreakers, flush_suit = HandEvaluator._rank_codes(codes)
+        return rank, tuple(tiebreakers), flush_suit
+
+    @staticmethod
+    def _rank_codes(codes: List[int]) -> Tuple[int, List[int], int]:
+        """Rank the best hand within 5-7 card codes in a single pass."""
+        rank_hist = [0] * 13
+        suit_masks = [0, 0, 0, 0]
+        for code in codes:
+            r = code >> 2
+            rank_hist[r] += 1
+            suit_masks[code & 3] |= 1 << r
+
+        # With at most 7 cards (checked above) a flush can't coexist with
+        # quads or a full house, so only a straight flush outranks it
+        for suit_index, mask in enumerate(suit_masks):
+            if mask.bit_count() >= 5:
+                high = STRAIGHT_TABLE[mask]
+                if high == 14:
+                    return HandRank.ROYAL_FLUSH, [14], suit_index
+                if high:
+                    return HandRank.STRAIGHT_FLUSH, [high], suit_index
+                return HandRank.FLUSH, list(TOP_RANKS_TABLE[mask][:5]), suit_index
+
+        rank_bits = suit_masks[0] | suit_masks[1] | suit_masks[2] | suit_masks[3]
+        quads = 0
+        trips = []
+        pairs = []
+        for r in range(12, -1, -1):
+            count = rank_hist[r]
+            if count == 4:
+                quads = r + 2
+            elif count == 3:
+                trips.append(r + 2)
+            elif count == 2:
+                pairs.append(r + 2)
+
+        if quads:
+            kicker = TOP_RANKS_TABLE[rank_bits & ~(1 << (quads - 2))][0]
+            return HandRank.FOUR_OF_A_KIND, [quads, kicker], -1
+
+        if trips and (len(trips) > 1 or pairs):
+            pair = max(trips[1] if len(trips) > 1 else 0, pairs[0] if pairs else 0)
+            return HandRank.FULL_HOUSE, [trips[0], pair], -1
+
+        high = STRAIGHT_TABLE[rank_bits]
+        if high:
+            return HandRank.STRAIGHT, [high], -1
+
+        if trips:
+            kickers = TOP_RANKS_TABLE[rank_bits & ~(1 << (trips[0] - 2))][:2]
+            return HandRank.THREE_OF_A_KIND, [trips[0], *kickers], -1
+
+        if len(pairs) >= 2:
+            rest = rank_bits & ~(1 << (pairs[0] - 2)) & ~(1 << (pairs[1] - 2))
+            return HandRank.TWO_PAIR, [pairs[0], pairs[1], TOP_RANKS_TABLE[rest][0]], -1
+
+        if pairs:
+            kickers = TOP_RANKS_TABLE[rank_bits & ~(1 << (pairs[0] - 2))][:3]
+            return HandRank.PAIR, [pairs[0], *kickers], -1
+
+        return HandRank.HIGH_CARD, list(TOP_RANKS_TABLE[rank_bits][:5]), -1
+
+    @staticmethod
+    def _select_cards(cards: List[Card], rank: int, tiebreakers: List[int],
+                      flush_suit: int) -> List[Card]:
+        """Pick the five cards that make up an already-ranked hand."""
+        if rank in (HandRank.STRAIGHT, HandRank.STRAIGHT_FLUSH, HandRank.ROYAL_FLUSH):
+            high = tiebreakers[0]
+            values = [high - i for i in range(5)] if high > 5 else [5, 4, 3, 2, 14]
+        elif rank == HandRank.FLUSH:
+            values = tiebreakers
+        else:
+            picked = []
+            for v, size in zip(tiebreakers, _GROUP_SIZES[rank]):
+                picked.extend([c for c in cards if c.value == v][:size])
+            return picked
+
+        pool = cards if flush_suit < 0 else [c for c in cards if c.code & 3 == flush_suit]
+        by_value = {}
+        for c in pool:
+            by_value.setdefault(c.value, c)
+        return [by_value[v] for v in values]
+
+    @staticmethod
+    def community_key(community_cards: List[Card]) -> int:
+        """Precompute the shared board's card-set key for best_hand."""
+        return HandEvaluator._card_set_key(community_cards)
+
+    @staticmethod
+    def best_hand(hole_cards: List[Card], community_cards: List[Card],
+                  community_key: Optional[int] = None) -> Tuple[List[Card], int, List[int], str]:
         """
         Find the best 5-card hand from hole cards + community cards.
+        community_key: optional result of community_key(community_cards),
+        so a board shared by several players is only keyed once
         Returns: (best_5_cards, rank, tiebreakers, description)
         """
         all_cards = hole_cards + community_cards
         if len(all_cards) < 5:
             raise ValueError("Need at least 5 cards to evaluate")
 
-        best_hand = None
-        best_rank = (0, [])
-        best_desc = ""
-
-        for combo in combinations(all_cards, 5):
-            cards = list(combo)
-            rank, tiebreakers, desc = HandEvaluator.evaluate(cards)
-            if (rank, tiebreakers) > best_rank:
-                best_rank = (rank, tiebreakers)
-                best_hand = cards
-                best_desc = desc
-
-        return best_hand, best_rank[0], best_rank[1], best_desc
+        key = None
+        if community_key is not None:
+            key = community_key | HandEvaluator._card_set_key(hole_cards)
+        rank, tiebreakers, flush_suit = HandEvaluator._rank_cards(all_cards, key)
+        best_cards = HandEvaluator._select_cards(all_cards, rank, tiebreakers, flush_suit)
+        return best_cards, rank, tiebreakers, HandEvaluator._describe(rank, tiebreakers)
 
     @staticmethod
     def compare_hands(hands: List[Tuple[List[Card], List[Card]]]) -> List[int]:
@@ -155,10 +303,23 @@ class HandEvaluator:
         if not hands:
             return []
 
+        # Players normally share one community list; build its card-set key
+        # once and add each player's hole cards to it
+        community_keys = {}
         evaluations = []
         for hole, community in hands:
-            _, rank, tiebreakers, _ = HandEvaluator.best_hand(hole, community)
-            evaluations.append((rank, tiebreakers))
+            community_key = community_keys.get(id(community))
+            if community_key is None:
+                community_key = HandEvaluator._card_set_key(community)
+                community_keys[id(community)] = community_key
+            key = community_key | HandEvaluator._card_set_key(hole)
+            count = len(hole) + len(community)
+            if 5 <= count <= 7 and key.bit_count() == count:
+                rank, tiebreakers, _ = HandEvaluator._rank_card_set(key)
+                evaluations.append(HandEvaluator.score(rank, tiebreakers))
+            else:
+                # Wrong card count raises; duplicate cards take the slow path
+                evaluations.append(HandEvaluator.eval7(hole + community))
 
         max_eval = max(evaluations)
         return [i for i, e in enumerate(evaluations) if e == max_eval]
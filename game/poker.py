@@ -1,56 +1,94 @@
 """Poker card and deck implementation."""
 
 import random
-from dataclasses import dataclass
 from typing import List
 
 
 SUITS = ['hearts', 'diamonds', 'clubs', 'spades']
 RANKS = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']
 RANK_VALUES = {rank: i for i, rank in enumerate(RANKS, 2)}
+SUIT_INDEX = {suit: i for i, suit in enumerate(SUITS)}
+SUIT_SYMBOLS = ['♥', '♦', '♣', '♠']
 
 
-@dataclass
 class Card:
-    rank: str
-    suit: str
+    """A playing card stored as a packed int: rank_index << 2 | suit_index.
 
-    def __post_init__(self):
-        if self.rank not in RANKS:
-            raise ValueError(f"Invalid rank: {self.rank}")
-        if self.suit not in SUITS:
-            raise ValueError(f"Invalid suit: {self.suit}")
+    rank and suit strings are only derived at the (de)serialization
+    boundaries; hashing, equality and hand evaluation work on the int.
+
+    Cards are immutable flyweights: Card(rank, suit) returns the one
+    shared instance for that card.
+    """
+
+    __slots__ = ('_code',)
+
+    def __new__(cls, rank: str, suit: str):
+        if rank not in RANK_VALUES:
+            raise ValueError(f"Invalid rank: {rank}")
+        if suit not in SUIT_INDEX:
+            raise ValueError(f"Invalid suit: {suit}")
+        return _FULL_DECK[(RANK_VALUES[rank] - 2) << 2 | SUIT_INDEX[suit]]
+
+    @classmethod
+    def from_code(cls, code: int) -> 'Card':
+        """Get a card directly from its packed code (0-51)."""
+        return _FULL_DECK[code]
+
+    def __reduce__(self):
+        # Copies and unpickled cards resolve back to the shared instance
+        return Card.from_code, (self._code,)
+
+    @property
+    def code(self) -> int:
+        return self._code
+
+    @property
+    def rank(self) -> str:
+        return RANKS[self._code >> 2]
+
+    @property
+    def suit(self) -> str:
+        return SUITS[self._code & 3]
 
     @property
     def value(self) -> int:
-        return RANK_VALUES[self.rank]
+        return (self._code >> 2) + 2
 
     def to_dict(self) -> dict:
-        return {'rank': self.rank, 'suit': self.suit}
+        """Serialize the card. The dict is shared per card; don't mutate it."""
+        return _CARD_DICTS[self._code]
 
     @classmethod
     def from_dict(cls, data: dict) -> 'Card':
         return cls(rank=data['rank'], suit=data['suit'])
 
     def __str__(self) -> str:
-        suit_symbols = {
-            'hearts': '♥',
-            'diamonds': '♦',
-            'clubs': '♣',
-            'spades': '♠'
-        }
-        return f"{self.rank}{suit_symbols[self.suit]}"
+        return f"{self.rank}{SUIT_SYMBOLS[self._code & 3]}"
 
     def __repr__(self) -> str:
         return str(self)
 
     def __hash__(self) -> int:
-        return hash((self.rank, self.suit))
+        return self._code
 
     def __eq__(self, other) -> bool:
         if not isinstance(other, Card):
             return False
-        return self.rank == other.rank and self.suit == other.suit
+        return self._code == other._code
+
+
+def _make_card(code: int) -> Card:
+    card = object.__new__(Card)
+    card._code = code
+    return card
+
+
+# Cards are immutable, so every deck can share one instance per card
+_FULL_DECK = tuple(_make_card(code) for code in range(52))
+
+# ...and every game state can share one serialized dict per card
+_CARD_DICTS = tuple({'rank': c.rank, 'suit': c.suit} for c in _FULL_DECK)
 
 
 class Deck:
@@ -60,24 +98,33 @@ class Deck:
 
     def reset(self):
         """Reset and shuffle the deck."""
-        self.cards = [Card(rank, suit) for suit in SUITS for rank in RANKS]
+        self.cards = list(_FULL_DECK)
         self.shuffle()
 
     def shuffle(self):
         """Shuffle the deck."""
         random.shuffle(self.cards)
 
+    def sample(self, count: int) -> List[Card]:
+        """Draw random cards without removing them from the deck (for simulations)."""
+        if count > len(self.cards):
+            raise ValueError(f"Not enough cards in deck. Requested {count}, have {len(self.cards)}")
+        return random.sample(self.cards, count)
+
     def deal(self, count: int = 1) -> List[Card]:
-        """Deal cards from the deck."""
+        """Deal cards from the deck (the top of the deck is the end of the list)."""
         if count > len(self.cards):
             raise ValueError(f"Not enough cards in deck. Requested {count}, have {len(self.cards)}")
-        dealt = self.cards[:count]
-        self.cards = self.cards[count:]
+        idx = len(self.cards) - count
+        dealt = self.cards[idx:]
+        del self.cards[idx:]
         return dealt
 
     def deal_one(self) -> Card:
         """Deal a single card."""
-        return self.deal(1)[0]
+        if not self.cards:
+            raise ValueError("Not enough cards in deck. Requested 1, have 0")
+        return self.cards.pop()
 
     def __len__(self) -> int:
         return len(self.cards)
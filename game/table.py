@@ -1,8 +1,10 @@
 """Table and player management for Texas Hold'em."""
 
+import sys
+from bisect import insort
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterator, List, Optional, Any, Tuple
 from .poker import Card, Deck
 from .hand_evaluator import HandEvaluator
 
@@ -25,7 +27,24 @@ class ActionType(Enum):
     ALL_IN = "all_in"
 
 
-@dataclass
+# Table keeps its phase as a small int on the hot path; GamePhase is only
+# built at the API boundary (Table.phase). PHASES[i] is the phase for int i.
+PHASES = tuple(GamePhase)
+(PHASE_WAITING, PHASE_PREFLOP, PHASE_FLOP, PHASE_TURN, PHASE_RIVER,
+ PHASE_SHOWDOWN, PHASE_WAITING_RUN_TWICE) = range(len(PHASES))
+PHASE_VALUES = tuple(phase.value for phase in PHASES)
+PHASE_INDEX = {phase: i for i, phase in enumerate(PHASES)}
+
+# Action strings from clients map straight to members, skipping Enum lookup
+ACTION_TYPES = {action.value: action for action in ActionType}
+
+
+# Table.action_history stores each action as a plain
+# (player, action, amount, phase) tuple; these are its dict keys
+ACTION_FIELDS = ('player', 'action', 'amount', 'phase')
+
+
+@dataclass(slots=True)
 class Action:
     player_name: str
     action_type: ActionType
@@ -41,7 +60,7 @@ class Action:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class Player:
     name: str
     seat: int
@@ -53,6 +72,11 @@ class Player:
     is_all_in: bool = False
     is_sitting_out: bool = False
 
+    def __post_init__(self):
+        # Names key the seat index, run-it-twice choices and hand results;
+        # one shared string object lets those lookups match by identity
+        self.name = sys.intern(self.name)
+
     def reset_for_hand(self):
         self.hole_cards = []
         self.current_bet = 0
@@ -76,12 +100,32 @@ class Player:
             data['hole_cards'] = [c.to_dict() for c in self.hole_cards]
         return data
 
+    @classmethod
+    def from_dict(cls, data: dict) -> 'Player':
+        """Build a player from its to_dict(show_cards=True) / serialize form."""
+        return cls(
+            name=data['name'],
+            seat=data['seat'],
+            stack=data['stack'],
+            hole_cards=[Card.from_dict(c) for c in data.get('hole_cards', [])],
+            current_bet=data['current_bet'],
+            total_bet=data['total_bet'],
+            is_folded=data['is_folded'],
+            is_all_in=data['is_all_in'],
+            is_sitting_out=data['is_sitting_out']
+        )
 
-@dataclass
+
+@dataclass(slots=True)
 class Pot:
-    """Represents a pot (main or side) with eligible players."""
+    """Represents a pot (main or side) with eligible players.
+
+    eligible_mask holds the same players as seat bits (1 << seat), which
+    is what pot distribution tests against.
+    """
     amount: int = 0
     eligible_players: List[str] = field(default_factory=list)
+    eligible_mask: int = 0
 
     def to_dict(self) -> dict:
         return {
@@ -89,6 +133,172 @@ class Pot:
             'eligible_players': self.eligible_players
         }
 
+    @classmethod
+    def from_dict(cls, data: dict, seat_by_name: Dict[str, int]) -> 'Pot':
+        names = data['eligible_players']
+        mask = 0
+        for name in names:
+            if name in seat_by_name:
+                mask |= 1 << seat_by_name[name]
+        return cls(amount=data['amount'], eligible_players=names, eligible_mask=mask)
+
+
+@dataclass(slots=True)
+class HandResult:
+    """One player's evaluated hand at showdown."""
+    player: Player
+    rank: int
+    score: int  # HandEvaluator.score; higher wins, equal splits
+    description: str
+    best_cards: List[Card]
+
+
+MAX_SEATS = 9
+ALL_SEATS_MASK = (1 << MAX_SEATS) - 1
+
+
+def _position_name(num_players: int, relative_pos: int) -> str:
+    """Position name for the seat relative_pos places after the button."""
+    # Heads-up special case
+    if num_players == 2:
+        if relative_pos == 0:
+            return "BTN"  # Button is also SB in heads-up
+        else:
+            return "BB"
+
+    # 3+ players
+    if relative_pos == 0:
+        return "BTN"
+    elif relative_pos == 1:
+        return "SB"
+    elif relative_pos == 2:
+        return "BB"
+
+    # Positions after BB (counting from BB as position 0)
+    pos_after_bb = relative_pos - 2
+    positions_after_bb = num_players - 3  # Exclude BTN, SB, BB
+
+    if positions_after_bb <= 0:
+        return ""
+
+    # For different table sizes, assign position names
+    # Last position before BTN is CO, before that is HJ
+    if pos_after_bb == positions_after_bb:
+        return "CO"  # Cutoff (last before button)
+
+    if positions_after_bb >= 2 and pos_after_bb == positions_after_bb - 1:
+        return "HJ"  # Hijack (2nd last before button)
+
+    # UTG positions (first positions after BB)
+    if pos_after_bb == 1:
+        return "UTG"
+    elif pos_after_bb == 2 and positions_after_bb >= 4:
+        return "UTG+1"
+
+    # Middle positions
+    if positions_after_bb >= 5 and pos_after_bb == 3:
+        return "MP"
+    if positions_after_bb >= 6 and pos_after_bb == 4:
+        return "MP+1"
+
+    # Fallback for edge cases
+    return "MP"
+
+
+# POSITION_NAMES[n][i] is the name of the seat i places after the button
+# with n active players
+POSITION_NAMES = {
+    n: tuple(_position_name(n, i) for i in range(n))
+    for n in range(2, MAX_SEATS + 1)
+}
+
+
+class SeatMap:
+    """Seat -> Player mapping backed by a fixed-size list.
+
+    Behaves like the dict it replaces (len, in, [], get, keys/values/items),
+    but seat lookups are plain list indexing and the occupied seats are kept
+    sorted as players come and go, so clockwise iteration needs no sort.
+    The occupied seats are also kept as a bitmask (bit n = seat n), and
+    players are indexed by name.
+    """
+
+    __slots__ = ('_slots', '_occupied', '_by_name', 'mask')
+
+    def __init__(self, size: int = MAX_SEATS):
+        self._slots: List[Optional[Player]] = [None] * size
+        self._occupied: List[int] = []
+        self._by_name: Dict[str, int] = {}  # name -> lowest seat with that name
+        self.mask = 0
+
+    @property
+    def seats(self) -> List[int]:
+        """Occupied seats in clockwise order (do not mutate)."""
+        return self._occupied
+
+    def __getitem__(self, seat: int) -> Player:
+        player = self.get(seat)
+        if player is None:
+            raise KeyError(seat)
+        return player
+
+    def seat_of(self, name: str) -> Optional[int]:
+        """Seat of the player with this name, if seated."""
+        return self._by_name.get(name)
+
+    def get(self, seat: Optional[int], default: Optional[Player] = None) -> Optional[Player]:
+        if seat is None or not 0 <= seat < len(self._slots):
+            return default
+        player = self._slots[seat]
+        return default if player is None else player
+
+    def __setitem__(self, seat: int, player: Player):
+        previous = self._slots[seat]
+        if previous is None:
+            insort(self._occupied, seat)
+            self.mask |= 1 << seat
+        self._slots[seat] = player
+        if previous is not None:
+            self._reindex(previous.name)
+        self._reindex(player.name)
+
+    def __delitem__(self, seat: int):
+        if self.get(seat) is None:
+            raise KeyError(seat)
+        name = self._slots[seat].name
+        self._slots[seat] = None
+        self._occupied.remove(seat)
+        self.mask &= ~(1 << seat)
+        self._reindex(name)
+
+    def _reindex(self, name: str):
+        """Point the name index at the lowest seat holding that name, if any."""
+        self._by_name.pop(name, None)
+        for seat in self._occupied:
+            if self._slots[seat].name == name:
+                self._by_name[name] = seat
+                return
+
+    def __contains__(self, seat) -> bool:
+        return self.get(seat) is not None
+
+    def __len__(self) -> int:
+        return len(self._occupied)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._occupied)
+
+    def keys(self) -> List[int]:
+        return list(self._occupied)
+
+    def values(self) -> List[Player]:
+        slots = self._slots
+        return [slots[seat] for seat in self._occupied]
+
+    def items(self) -> List[Tuple[int, Player]]:
+        slots = self._slots
+        return [(seat, slots[seat]) for seat in self._occupied]
+
 
 class Table:
     def __init__(self, room_id: str, small_blind: int = 1, big_blind: int = 2,
@@ -99,12 +309,14 @@ class Table:
         self.min_buy_in = min_buy_in
         self.max_buy_in = max_buy_in
 
-        self.players: Dict[int, Player] = {}  # seat -> Player
+        self.players = SeatMap()  # seat -> Player
         self.deck = Deck()
         self.community_cards: List[Card] = []
         self.pots: List[Pot] = []  # Main pot + side pots
+        self._pot_pool: List[Pot] = []  # Retired Pot objects for reuse
+        self._any_all_in = False  # Set once anyone goes all-in this hand
 
-        self.phase = GamePhase.WAITING
+        self._phase = PHASE_WAITING
         self.dealer_seat: Optional[int] = None
         self.current_player_seat: Optional[int] = None
         self.last_aggressor_seat: Optional[int] = None  # Last player who bet/raised
@@ -112,17 +324,31 @@ class Table:
         self.last_raise_amount = 0  # Track the last raise increment for min-raise rule
 
         self.hand_number = 0
-        self.action_history: List[Action] = []
+        self.action_history: List[Tuple[str, str, int, str]] = []  # See ACTION_FIELDS
+        self._action_dicts: List[dict] = []  # Dict form of action_history, built lazily
+        self._action_dicts_source: Optional[list] = None  # The action_history list they mirror
         self._last_hand_result: Optional[dict] = None
         self._bb_has_option: bool = False  # Track if BB still has option to raise preflop
+        self._heads_up: Optional[bool] = None  # Fixed for the hand by start_hand
+        self._sb_seat: Optional[int] = None  # Blind seats, fixed for the hand by _post_blinds
+        self._bb_seat: Optional[int] = None
+        self._position_key: Optional[tuple] = None  # (dealer_seat, active seats) of _position_cache
+        self._position_cache: Dict[int, str] = {}
 
         # Run it twice state
         self._run_twice_eligible: bool = False
         self._run_twice_choices: Dict[str, bool] = {}  # player_name -> wants_twice
         self._run_twice_players: List[str] = []  # All-in players who can choose
-        self._saved_deck_state: Optional[List[Card]] = None  # Save deck for second run
         self._saved_community_cards: List[Card] = []  # Cards dealt before run-twice
 
+    @property
+    def phase(self) -> GamePhase:
+        return PHASES[self._phase]
+
+    @phase.setter
+    def phase(self, phase: GamePhase):
+        self._phase = PHASE_INDEX[phase]
+
     @property
     def pot(self) -> int:
         """Total pot amount (all pots combined)."""
@@ -130,7 +356,7 @@ class Table:
 
     def add_player(self, name: str, stack: int, seat: Optional[int] = None) -> Optional[Player]:
         """Add a player to the table."""
-        if len(self.players) >= 9:
+        if len(self.players) >= MAX_SEATS:
             return None
 
         # Validate stack
@@ -138,11 +364,11 @@ class Table:
 
         # Find available seat
         if seat is None:
-            for s in range(9):
+            for s in range(MAX_SEATS):
                 if s not in self.players:
                     seat = s
                     break
-        elif seat in self.players:
+        elif not isinstance(seat, int) or not 0 <= seat < MAX_SEATS or seat in self.players:
             return None
 
         if seat is None:
@@ -150,22 +376,25 @@ class Table:
 
         player = Player(name=name, seat=seat, stack=stack)
         self.players[seat] = player
+        self._heads_up = None
         return player
 
     def remove_player(self, name: str) -> bool:
         """Remove a player from the table."""
-        for seat, player in list(self.players.items()):
-            if player.name == name:
-                del self.players[seat]
-                return True
-        return False
+        seat = self.players.seat_of(name)
+        if seat is None:
+            return False
+
+        del self.players[seat]
+        # Seat-derived snapshots may point at the empty seat now
+        self._heads_up = None
+        self._sb_seat = None
+        self._bb_seat = None
+        return True
 
     def get_player_by_name(self, name: str) -> Optional[Player]:
         """Get player by name."""
-        for player in self.players.values():
-            if player.name == name:
-                return player
-        return None
+        return self.players.get(self.players.seat_of(name))
 
     def get_active_players(self) -> List[Player]:
         """Get players who can participate in a new hand (have chips, not sitting out)."""
@@ -182,47 +411,36 @@ class Table:
         return [p for p in self.players.values()
                 if p.total_bet > 0 or len(p.hole_cards) > 0]
 
-    def _get_seats_in_order(self) -> List[int]:
-        """Get all occupied seats in clockwise order starting from seat 0."""
-        return sorted(self.players.keys())
-
     def _get_next_seat(self, current_seat: int, skip_folded: bool = True,
                        skip_all_in: bool = False, skip_sitting_out: bool = True) -> Optional[int]:
         """Get the next occupied seat after current_seat in clockwise order."""
-        seats = self._get_seats_in_order()
-        if not seats:
-            return None
-
-        # Find index of current seat or the next one
-        current_idx = -1
-        for i, s in enumerate(seats):
-            if s == current_seat:
-                current_idx = i
-                break
-            elif s > current_seat and current_idx == -1:
-                current_idx = i - 1
-                break
-
-        if current_idx == -1:
-            current_idx = len(seats) - 1
-
-        # Search for next valid seat
-        for i in range(1, len(seats) + 1):
-            seat = seats[(current_idx + i) % len(seats)]
-            player = self.players[seat]
-            if skip_sitting_out and player.is_sitting_out:
-                continue
-            if skip_folded and player.is_folded:
-                continue
-            if skip_all_in and player.is_all_in:
-                continue
-            if seat != current_seat:
+        players = self.players
+        mask = players.mask & ~(1 << current_seat)
+
+        # Rotate the occupancy mask so bit 0 is the seat right after
+        # current_seat; lowest set bits are then candidates in clockwise order
+        start = current_seat + 1
+        rotated = ((mask >> start) | (mask << (MAX_SEATS - start))) & ALL_SEATS_MASK
+        while rotated:
+            low = rotated & -rotated
+            seat = (start + low.bit_length() - 1) % MAX_SEATS
+            player = players[seat]
+            if not ((skip_sitting_out and player.is_sitting_out) or
+                    (skip_folded and player.is_folded) or
+                    (skip_all_in and player.is_all_in)):
                 return seat
+            rotated ^= low
         return None
 
     def _is_heads_up(self) -> bool:
-        """Check if this is a heads-up (2 player) game."""
-        return len(self.get_active_players()) == 2
+        """Check if this is a heads-up (2 player) game.
+
+        Snapshotted by start_hand, so a player going all-in (stack 0)
+        mid-hand doesn't change the blind and action order.
+        """
+        if self._heads_up is None:
+            self._heads_up = len(self.get_active_players()) == 2
+        return self._heads_up
 
     def _get_sb_seat(self) -> int:
         """Get small blind seat.
@@ -230,6 +448,8 @@ class Table:
         Heads-up: Button is small blind.
         3+ players: First player left of button.
         """
+        if self._sb_seat is not None:
+            return self._sb_seat
         if self._is_heads_up():
             return self.dealer_seat
         return self._get_next_seat(self.dealer_seat, skip_folded=False, skip_all_in=False)
@@ -239,6 +459,8 @@ class Table:
 
         Always the first player left of small blind.
         """
+        if self._bb_seat is not None:
+            return self._bb_seat
         sb_seat = self._get_sb_seat()
         return self._get_next_seat(sb_seat, skip_folded=False, skip_all_in=False)
 
@@ -252,15 +474,20 @@ class Table:
         self.hand_number += 1
         self.deck.reset()
         self.community_cards = []
-        self.pots = [Pot()]  # Start with empty main pot
+        self._recycle_pots()
+        self.pots = [self._alloc_pot()]  # Start with empty main pot
         self.action_history = []
         self.current_bet = 0
         self.last_raise_amount = self.big_blind  # Initial min-raise is big blind
         self.last_aggressor_seat = None
         self._last_hand_result = None
+        self._heads_up = len(active) == 2
+        self._sb_seat = None
+        self._bb_seat = None
 
         for player in self.players.values():
             player.reset_for_hand()
+        self._any_all_in = False
 
         # Move dealer button
         if self.dealer_seat is None:
@@ -273,11 +500,11 @@ class Table:
         # Post blinds
         self._post_blinds()
 
-        # Deal hole cards to active players
-        for player in self.get_active_players():
+        # Deal hole cards to active players (including anyone all-in from a blind)
+        for player in active:
             player.hole_cards = self.deck.deal(2)
 
-        self.phase = GamePhase.PREFLOP
+        self._phase = PHASE_PREFLOP
 
         # Set first player to act preflop
         self._set_first_to_act_preflop()
@@ -288,36 +515,43 @@ class Table:
         """Post small and big blinds."""
         sb_seat = self._get_sb_seat()
         bb_seat = self._get_bb_seat()
+        # Blind seats can't change during a hand; later lookups reuse them
+        self._sb_seat = sb_seat
+        self._bb_seat = bb_seat
 
         sb_player = self.players.get(sb_seat)
         bb_player = self.players.get(bb_seat)
 
         # Post small blind
         if sb_player:
-            sb_amount = min(self.small_blind, sb_player.stack)
-            sb_player.stack -= sb_amount
-            sb_player.current_bet = sb_amount
-            sb_player.total_bet = sb_amount
-            self.pots[0].amount += sb_amount
-            if sb_player.stack == 0:
-                sb_player.is_all_in = True
+            self._commit_chips(sb_player, self.small_blind)
 
         # Post big blind
         if bb_player:
-            bb_amount = min(self.big_blind, bb_player.stack)
-            bb_player.stack -= bb_amount
-            bb_player.current_bet = bb_amount
-            bb_player.total_bet = bb_amount
-            self.pots[0].amount += bb_amount
-            self.current_bet = bb_amount
-            if bb_player.stack == 0:
-                bb_player.is_all_in = True
+            self.current_bet, _ = self._commit_chips(bb_player, self.big_blind)
 
         # Big blind has option to raise even if everyone just calls
         self._bb_has_option = True
         # Initially no aggressor (blinds don't count as aggression)
         self.last_aggressor_seat = None
 
+    def _commit_chips(self, player: Player, chips: int) -> Tuple[int, bool]:
+        """Move up to `chips` from a player's stack into their bet and the pot.
+
+        Returns: (chips actually paid, whether the player is now all-in)
+        """
+        stack = player.stack
+        paid = chips if chips < stack else stack
+        stack -= paid
+        player.stack = stack
+        player.current_bet += paid
+        player.total_bet += paid
+        self.pots[0].amount += paid
+        if stack == 0:
+            player.is_all_in = True
+            self._any_all_in = True
+        return paid, stack == 0
+
     def _set_first_to_act_preflop(self):
         """Set the first player to act preflop.
 
@@ -373,34 +607,32 @@ class Table:
             return {'success': False, 'error': 'Cannot act'}
 
         # Clear BB option when BB acts in preflop
-        if self.phase == GamePhase.PREFLOP and self._bb_has_option:
+        if self._phase == PHASE_PREFLOP and self._bb_has_option:
             bb_seat = self._get_bb_seat()
             if player.seat == bb_seat:
                 self._bb_has_option = False
 
-        action = ActionType(action_type)
+        action = ACTION_TYPES.get(action_type)
+        if action is None:
+            raise ValueError(f"{action_type!r} is not a valid ActionType")
         result = {'success': True}
         action_amount = 0
 
-        if action == ActionType.FOLD:
+        if action is ActionType.FOLD:
             player.is_folded = True
 
-        elif action == ActionType.CHECK:
+        elif action is ActionType.CHECK:
             if player.current_bet < self.current_bet:
                 return {'success': False, 'error': 'Cannot check, must call or raise'}
 
-        elif action == ActionType.CALL:
-            call_amount = min(self.current_bet - player.current_bet, player.stack)
-            player.stack -= call_amount
-            player.current_bet += call_amount
-            player.total_bet += call_amount
-            self.pots[0].amount += call_amount
-            action_amount = call_amount
-            if player.stack == 0:
-                player.is_all_in = True
+        elif action is ActionType.CALL:
+            action_amount, went_all_in = self._commit_chips(
+                player, self.current_bet - player.current_bet
+            )
+            if went_all_in:
                 action = ActionType.ALL_IN
 
-        elif action == ActionType.RAISE:
+        elif action is ActionType.RAISE:
             raise_to = amount
             raise_increment = raise_to - self.current_bet
 
@@ -412,18 +644,12 @@ class Table:
             if raise_increment < self.last_raise_amount and player.stack > chips_needed:
                 return {'success': False, 'error': f'Minimum raise to {min_raise_to}'}
 
-            if chips_needed >= player.stack:
+            _, went_all_in = self._commit_chips(player, chips_needed)
+            if went_all_in:
                 # All-in for less than min-raise is allowed
-                chips_needed = player.stack
-                raise_to = player.current_bet + chips_needed
+                raise_to = player.current_bet
                 raise_increment = raise_to - self.current_bet
-                player.is_all_in = True
                 action = ActionType.ALL_IN
-
-            player.stack -= chips_needed
-            player.current_bet += chips_needed
-            player.total_bet += chips_needed
-            self.pots[0].amount += chips_needed
             action_amount = raise_to
 
             # Update betting state
@@ -433,13 +659,8 @@ class Table:
                 self.current_bet = raise_to
                 self.last_aggressor_seat = player.seat
 
-        elif action == ActionType.ALL_IN:
-            all_in_amount = player.stack
-            player.current_bet += all_in_amount
-            player.total_bet += all_in_amount
-            self.pots[0].amount += all_in_amount
-            player.stack = 0
-            player.is_all_in = True
+        elif action is ActionType.ALL_IN:
+            self._commit_chips(player, player.stack)
             action_amount = player.current_bet
 
             if player.current_bet > self.current_bet:
@@ -450,12 +671,9 @@ class Table:
                 self.current_bet = player.current_bet
 
         # Record action
-        self.action_history.append(Action(
-            player_name=player_name,
-            action_type=action,
-            amount=action_amount,
-            phase=self.phase.value
-        ))
+        self.action_history.append(
+            (player_name, action.value, action_amount, PHASE_VALUES[self._phase])
+        )
 
         # Advance to next player or phase
         self._advance_game()
@@ -468,66 +686,74 @@ class Table:
 
         # Check if hand is over (only one player left)
         if len(players_in_hand) <= 1:
-            self._calculate_side_pots()
-            self._end_hand_single_winner()
+            self._calculate_side_pots(players_in_hand)
+            self._end_hand_single_winner(players_in_hand)
             return
 
-        # Check if betting round is complete
-        active_players = [p for p in players_in_hand if not p.is_all_in]
+        # One pass over the players in hand: count those who can still act
+        # and check that all of them have matched the bet (all-in always counts)
+        current_bet = self.current_bet
+        active_count = 0
+        all_bets_matched = True
+        for p in players_in_hand:
+            if not p.is_all_in:
+                active_count += 1
+                if p.current_bet != current_bet:
+                    all_bets_matched = False
 
         # Find next player to act
         next_seat = self._get_next_seat(self.current_player_seat, skip_all_in=True)
 
-        # Check if all remaining players have matched the bet or are all-in
-        all_bets_matched = all(
-            p.current_bet == self.current_bet or p.is_all_in
-            for p in players_in_hand
-        )
-
-        if len(active_players) <= 1 and all_bets_matched:
+        if active_count <= 1 and all_bets_matched:
             # Everyone is all-in or folded except maybe one, and bets are settled
             # Calculate side pots and run out the board
-            self._calculate_side_pots()
-            self._run_out_board()
+            self._calculate_side_pots(players_in_hand)
+            self._run_out_board(players_in_hand)
             return
 
-        if len(active_players) == 0:
+        if active_count == 0:
             # Everyone is all-in, run out the board
-            self._calculate_side_pots()
-            self._run_out_board()
+            self._calculate_side_pots(players_in_hand)
+            self._run_out_board(players_in_hand)
             return
 
         # Check if betting round is complete
-        if self._is_betting_round_complete(next_seat):
-            self._calculate_side_pots()
-            self._next_phase()
+        if self._is_betting_round_complete(next_seat, players_in_hand):
+            self._calculate_side_pots(players_in_hand)
+            self._next_phase(players_in_hand)
         else:
             self.current_player_seat = next_seat
 
-    def _is_betting_round_complete(self, next_seat: Optional[int]) -> bool:
-        """Check if the current betting round is complete."""
+    def _is_betting_round_complete(self, next_seat: Optional[int],
+                                   players_in_hand: Optional[List[Player]] = None) -> bool:
+        """Check if the current betting round is complete.
+
+        players_in_hand may be passed when the caller already has it for
+        the current action.
+        """
         if next_seat is None:
             return True
 
-        players_in_hand = self.get_players_in_hand()
-
-        # All active players must have matched the current bet
-        all_matched = all(
-            p.current_bet == self.current_bet or p.is_all_in
-            for p in players_in_hand
-        )
-
-        if not all_matched:
-            return False
-
         # In preflop, BB must have option to act even if everyone just called
-        if self.phase == GamePhase.PREFLOP and self._bb_has_option:
-            bb_seat = self._get_bb_seat()
-            bb_player = self.players.get(bb_seat)
+        # (checked first: the blind seats are cached, so this costs no scan)
+        if self._bb_has_option and self._phase == PHASE_PREFLOP:
+            bb_player = self.players.get(self._get_bb_seat())
             if bb_player and not bb_player.is_folded and not bb_player.is_all_in:
                 # BB still has option, don't end round until BB acts
                 return False
 
+        if players_in_hand is None:
+            players_in_hand = self.get_players_in_hand()
+
+        # All active players must have matched the current bet. This must come
+        # before the aggressor check: a short all-in raises the bet without
+        # becoming the aggressor, so action can return to the aggressor
+        # with the bet still unmatched.
+        current_bet = self.current_bet
+        for p in players_in_hand:
+            if p.current_bet != current_bet and not p.is_all_in:
+                return False
+
         # If there's a last aggressor, round ends when action returns to them
         if self.last_aggressor_seat is not None:
             return next_seat == self.last_aggressor_seat
@@ -535,19 +761,33 @@ class Table:
         # No aggressor (everyone checked/called) - round complete when everyone has matched
         return True
 
-    def _calculate_side_pots(self):
+    def _calculate_side_pots(self, players_in_hand: Optional[List[Player]] = None):
         """Calculate main pot and side pots based on all-in amounts.
 
         Important: Pot amounts include contributions from ALL players (including folded),
         but only non-folded players are eligible to win.
         """
+        if players_in_hand is None:
+            players_in_hand = self.get_players_in_hand()  # Non-folded only, for eligibility
+
+        # Common case: nobody is all-in, so everything is one pot that every
+        # player still in the hand can win
+        if not self._any_all_in:
+            total = sum(p.total_bet for p in self.players.values())
+            if total or players_in_hand:
+                self._recycle_pots()
+                self.pots = [self._alloc_pot(total, players_in_hand)]
+                return
+
         # Get ALL players who contributed (including folded)
         all_contributors = self.get_players_who_contributed()
-        players_in_hand = self.get_players_in_hand()  # Non-folded only, for eligibility
-
         if not all_contributors:
             return
 
+        # The pots are rebuilt from scratch; recycle the old ones
+        self._recycle_pots()
+        alloc_pot = self._alloc_pot
+
         # Collect all unique bet amounts from players who went all-in (and are not folded)
         # We use non-folded all-in players to determine pot levels
         all_in_amounts = sorted(set(
@@ -557,66 +797,105 @@ class Table:
         if not all_in_amounts:
             # No side pots needed, just set eligible players for main pot
             total = sum(p.total_bet for p in all_contributors)
-            self.pots = [Pot(
-                amount=total,
-                eligible_players=[p.name for p in players_in_hand]
-            )]
+            self.pots = [alloc_pot(total, players_in_hand)]
             return
 
-        # Calculate pots - include ALL contributors for amounts, but only non-folded for eligibility
+        # Sweep the all-in levels upward. Every contributor still in `remaining`
+        # has bet at least prev_level; those below the next level pay their
+        # partial share into its pot and drop out, so each player is settled
+        # once instead of being re-examined at every level.
+        # Pot amounts include ALL contributors, but only non-folded are eligible.
         new_pots = []
         prev_level = 0
+        remaining = all_contributors
 
         for level in all_in_amounts:
             pot_amount = 0
-            eligible = []
-
-            for p in all_contributors:
+            still_in = []
+            for p in remaining:
                 if p.total_bet >= level:
-                    # Player contributed at least up to this level
-                    contribution = level - prev_level
-                    pot_amount += contribution
-                    # Only non-folded players are eligible to win
-                    if not p.is_folded:
-                        eligible.append(p.name)
-                elif p.total_bet > prev_level:
-                    # Player contributed partially to this level
-                    contribution = p.total_bet - prev_level
-                    pot_amount += contribution
-                    # Folded players still don't get added to eligible
+                    still_in.append(p)
+                else:
+                    pot_amount += p.total_bet - prev_level
+            pot_amount += (level - prev_level) * len(still_in)
 
             if pot_amount > 0:
-                new_pots.append(Pot(amount=pot_amount, eligible_players=eligible))
+                new_pots.append(alloc_pot(
+                    pot_amount, [p for p in still_in if not p.is_folded]
+                ))
 
+            remaining = still_in
             prev_level = level
 
         # Add remaining contributions (from players who bet more than highest all-in)
-        max_all_in = all_in_amounts[-1] if all_in_amounts else 0
-        final_pot_amount = 0
-        eligible = []
-
-        for p in all_contributors:
-            if p.total_bet > max_all_in:
-                contribution = p.total_bet - max_all_in
-                final_pot_amount += contribution
-                if not p.is_folded:
-                    eligible.append(p.name)
-
+        above = [p for p in remaining if p.total_bet > prev_level]
+        final_pot_amount = sum(p.total_bet for p in above) - prev_level * len(above)
         if final_pot_amount > 0:
-            new_pots.append(Pot(amount=final_pot_amount, eligible_players=eligible))
+            new_pots.append(alloc_pot(
+                final_pot_amount, [p for p in above if not p.is_folded]
+            ))
 
         # If no pots were created, create a single pot
         if not new_pots:
             total = sum(p.total_bet for p in all_contributors)
-            new_pots = [Pot(
-                amount=total,
-                eligible_players=[p.name for p in players_in_hand]
-            )]
+            new_pots = [alloc_pot(total, players_in_hand)]
 
         self.pots = new_pots
 
-    def _next_phase(self):
-        """Move to next betting phase."""
+    def _alloc_pot(self, amount: int = 0, eligible: Optional[List[Player]] = None) -> Pot:
+        """Get a Pot for the eligible players, reusing a recycled one when available."""
+        names = []
+        mask = 0
+        if eligible:
+            for p in eligible:
+                names.append(p.name)
+                mask |= 1 << p.seat
+        if self._pot_pool:
+            pot = self._pot_pool.pop()
+            pot.amount = amount
+            pot.eligible_players = names
+            pot.eligible_mask = mask
+            return pot
+        return Pot(amount=amount, eligible_players=names, eligible_mask=mask)
+
+    def _seat_names(self, mask: int) -> List[str]:
+        """Names of the players whose seat bits are set in mask, in seat order."""
+        names = []
+        while mask:
+            low = mask & -mask
+            names.append(self.players[low.bit_length() - 1].name)
+            mask ^= low
+        return names
+
+    def _award_pot_share(self, amount: int, winners_mask: int):
+        """Split amount between the players in winners_mask.
+
+        Odd chips go to the lowest seats first.
+        """
+        count = winners_mask.bit_count()
+        share, remainder = divmod(amount, count)
+        while winners_mask:
+            low = winners_mask & -winners_mask
+            self.players[low.bit_length() - 1].stack += share + (1 if remainder > 0 else 0)
+            remainder -= 1
+            winners_mask ^= low
+
+    def _recycle_pots(self):
+        """Retire the current pots into the pool.
+
+        Safe because nothing keeps a Pot past its replacement: results and
+        broadcasts copy pots via to_dict, and a recycled pot's eligible
+        list is replaced, never mutated.
+        """
+        self._pot_pool.extend(self.pots)
+        self.pots = []
+
+    def _next_phase(self, players_in_hand: Optional[List[Player]] = None):
+        """Move to next betting phase.
+
+        players_in_hand may be passed when the caller already has it for
+        the current action; nobody folds while the phase advances.
+        """
         # Reset for new betting round
         for player in self.players.values():
             player.current_bet = 0
@@ -625,67 +904,75 @@ class Table:
         self.last_aggressor_seat = None  # Reset aggressor for new round
         self._bb_has_option = False  # BB option only applies to preflop
 
-        if self.phase == GamePhase.PREFLOP:
+        if self._phase == PHASE_PREFLOP:
             self.community_cards.extend(self.deck.deal(3))
-            self.phase = GamePhase.FLOP
-        elif self.phase == GamePhase.FLOP:
+            self._phase = PHASE_FLOP
+        elif self._phase == PHASE_FLOP:
             self.community_cards.extend(self.deck.deal(1))
-            self.phase = GamePhase.TURN
-        elif self.phase == GamePhase.TURN:
+            self._phase = PHASE_TURN
+        elif self._phase == PHASE_TURN:
             self.community_cards.extend(self.deck.deal(1))
-            self.phase = GamePhase.RIVER
-        elif self.phase == GamePhase.RIVER:
-            self._showdown()
+            self._phase = PHASE_RIVER
+        elif self._phase == PHASE_RIVER:
+            self._showdown(players_in_hand)
             return
 
         # Set first player to act postflop
         self._set_first_to_act_postflop()
 
+        if players_in_hand is None:
+            players_in_hand = self.get_players_in_hand()
+
         # If only one player can act, go to showdown
-        active_players = [p for p in self.get_players_in_hand() if not p.is_all_in]
+        active_players = [p for p in players_in_hand if not p.is_all_in]
         if len(active_players) <= 1:
-            self._run_out_board()
+            self._run_out_board(players_in_hand)
 
-    def _run_out_board(self):
+    def _run_out_board(self, players_in_hand: Optional[List[Player]] = None):
         """Deal remaining community cards when no more betting possible."""
+        if players_in_hand is None:
+            players_in_hand = self.get_players_in_hand()
+
         # Check if run-it-twice is eligible (2+ players all-in)
-        all_in_players = [p for p in self.get_players_in_hand() if p.is_all_in]
+        all_in_players = [p for p in players_in_hand if p.is_all_in]
 
         if len(all_in_players) >= 2 and len(self.community_cards) < 5:
             # Save state for potential run-twice
             self._run_twice_eligible = True
             self._run_twice_choices = {}
             self._run_twice_players = [p.name for p in all_in_players]
+            # Nothing is dealt while waiting, so the deck itself holds the
+            # undealt cards for both runs
             self._saved_community_cards = self.community_cards.copy()
-            self._saved_deck_state = self.deck.cards.copy()  # Save deck state
 
             # Enter waiting for run-twice choices
-            self.phase = GamePhase.WAITING_RUN_TWICE
+            self._phase = PHASE_WAITING_RUN_TWICE
             return
 
-        self._deal_remaining_and_showdown()
+        self._deal_remaining_and_showdown(players_in_hand=players_in_hand)
 
-    def _deal_remaining_and_showdown(self, is_second_run: bool = False):
+    def _deal_remaining_and_showdown(self, is_second_run: bool = False,
+                                     players_in_hand: Optional[List[Player]] = None):
         """Deal remaining cards and go to showdown."""
         while len(self.community_cards) < 5:
             if len(self.community_cards) == 0:
                 self.community_cards.extend(self.deck.deal(3))
-                self.phase = GamePhase.FLOP
+                self._phase = PHASE_FLOP
             else:
                 self.community_cards.extend(self.deck.deal(1))
                 if len(self.community_cards) == 4:
-                    self.phase = GamePhase.TURN
+                    self._phase = PHASE_TURN
                 elif len(self.community_cards) == 5:
-                    self.phase = GamePhase.RIVER
+                    self._phase = PHASE_RIVER
 
         if is_second_run:
             self._showdown_second_run()
         else:
-            self._showdown()
+            self._showdown(players_in_hand)
 
     def process_run_twice_choice(self, player_name: str, wants_twice: bool) -> dict:
         """Process a player's run-it-twice choice."""
-        if self.phase != GamePhase.WAITING_RUN_TWICE:
+        if self._phase != PHASE_WAITING_RUN_TWICE:
             return {'success': False, 'error': 'Not waiting for run-twice choice'}
 
         if player_name not in self._run_twice_players:
@@ -719,22 +1006,14 @@ class Table:
         players_in_hand = self.get_players_in_hand()
 
         # First run - deal remaining cards WITHOUT distributing pot
-        first_community = self._saved_community_cards.copy()
-        deck_copy = self._saved_deck_state.copy()
-        while len(first_community) < 5:
-            first_community.append(deck_copy.pop(0))
+        needed = 5 - len(self._saved_community_cards)
+        first_community = self._saved_community_cards + self.deck.deal(needed)
 
         # Evaluate first run
         first_run_winners = self._evaluate_hands_for_community(players_in_hand, first_community)
 
-        # Second run - shuffle remaining deck and deal new cards
-        import random
-        deck_for_second = self._saved_deck_state.copy()
-        random.shuffle(deck_for_second)
-
-        second_community = self._saved_community_cards.copy()
-        while len(second_community) < 5:
-            second_community.append(deck_for_second.pop(0))
+        # Second run - random cards from what's left in the deck
+        second_community = self._saved_community_cards + self.deck.sample(needed)
 
         # Evaluate second run
         second_run_winners = self._evaluate_hands_for_community(players_in_hand, second_community)
@@ -745,94 +1024,66 @@ class Table:
         # Distribute pot based on both runs
         self._distribute_run_twice_pots(first_run_winners, second_run_winners, first_community, second_community)
 
-    def _evaluate_hands_for_community(self, players: List[Player], community: List[Card]) -> set:
-        """Evaluate hands for given community cards and return winner names."""
-        hand_results = []
-        for player in players:
-            if player.is_folded:
-                continue
-            best_cards, rank, tiebreakers, desc = HandEvaluator.best_hand(
-                player.hole_cards, community
-            )
-            hand_results.append({
-                'player': player,
-                'rank': rank,
-                'tiebreakers': tiebreakers
-            })
-
-        if not hand_results:
-            return set()
+    def _evaluate_hands_for_community(self, players: List[Player], community: List[Card]) -> int:
+        """Evaluate hands for given community cards and return the winners' seat mask."""
+        contenders = [p for p in players if not p.is_folded]
+        if not contenders:
+            return 0
 
-        # Find best hand
-        hand_results.sort(key=lambda x: (x['rank'], x['tiebreakers']), reverse=True)
-        best = (hand_results[0]['rank'], hand_results[0]['tiebreakers'])
-        winners = {
-            r['player'].name for r in hand_results
-            if (r['rank'], r['tiebreakers']) == best
-        }
-        return winners
+        # Only the winners matter here, so compare single-int scores and
+        # skip building best cards and descriptions
+        winner_indices = HandEvaluator.compare_hands(
+            [(p.hole_cards, community) for p in contenders]
+        )
+        mask = 0
+        for i in winner_indices:
+            mask |= 1 << contenders[i].seat
+        return mask
 
-    def _distribute_run_twice_pots(self, first_winners: set, second_winners: set,
+    def _distribute_run_twice_pots(self, first_winners: int, second_winners: int,
                                     first_community: List[Card], second_community: List[Card]):
-        """Distribute pots based on run-twice results."""
-        players_in_hand = self.get_players_in_hand()
+        """Distribute pots based on run-twice results.
 
-        if first_winners == second_winners:
-            # Same winner(s) both times - they get full pot
-            all_winners = first_winners
-            for pot in self.pots:
-                if pot.amount == 0:
-                    continue
-                eligible_winners = [p for p in players_in_hand
-                                   if p.name in pot.eligible_players and p.name in all_winners]
-                if eligible_winners:
-                    share = pot.amount // len(eligible_winners)
-                    remainder = pot.amount % len(eligible_winners)
-                    for i, winner in enumerate(eligible_winners):
-                        winner.stack += share + (1 if i < remainder else 0)
-        else:
-            # Different winners - split each pot 50/50
-            for pot in self.pots:
-                if pot.amount == 0:
-                    continue
+        first_winners and second_winners are seat masks from
+        _evaluate_hands_for_community.
+        """
+        award = self._award_pot_share
+        same_winners = first_winners == second_winners
+        for pot in self.pots:
+            if pot.amount == 0:
+                continue
 
+            if same_winners:
+                # Same winner(s) both times - they get full pot
+                halves = ((pot.amount, first_winners),)
+            else:
+                # Different winners - split each pot 50/50, first half
+                # to the first run's winners
                 first_half = pot.amount // 2
-                second_half = pot.amount - first_half
-
-                # First half to first run winners
-                first_eligible = [p for p in players_in_hand
-                                 if p.name in pot.eligible_players and p.name in first_winners]
-                if first_eligible:
-                    share = first_half // len(first_eligible)
-                    remainder = first_half % len(first_eligible)
-                    for i, winner in enumerate(first_eligible):
-                        winner.stack += share + (1 if i < remainder else 0)
-
-                # Second half to second run winners
-                second_eligible = [p for p in players_in_hand
-                                  if p.name in pot.eligible_players and p.name in second_winners]
-                if second_eligible:
-                    share = second_half // len(second_eligible)
-                    remainder = second_half % len(second_eligible)
-                    for i, winner in enumerate(second_eligible):
-                        winner.stack += share + (1 if i < remainder else 0)
+                halves = ((first_half, first_winners),
+                          (pot.amount - first_half, second_winners))
+
+            for amount, winners in halves:
+                eligible_winners = pot.eligible_mask & winners
+                if eligible_winners:
+                    award(amount, eligible_winners)
 
         # End hand
         self._last_hand_result = {
-            'winners': list(first_winners | second_winners),
+            'winners': self._seat_names(first_winners | second_winners),
             'pot': sum(p.amount for p in self.pots),
             'player_stacks': {p.name: p.stack for p in self.players.values()},
             'run_twice': True,
             'first_run': {
-                'winners': list(first_winners),
+                'winners': self._seat_names(first_winners),
                 'community': [c.to_dict() for c in first_community]
             },
             'second_run': {
-                'winners': list(second_winners),
+                'winners': self._seat_names(second_winners),
                 'community': [c.to_dict() for c in second_community]
             }
         }
-        self.phase = GamePhase.WAITING
+        self._phase = PHASE_WAITING
         self.current_player_seat = None
         self._run_twice_eligible = False
 
@@ -840,9 +1091,10 @@ class Table:
         """Placeholder - actual second run handling is in _run_it_twice."""
         pass
 
-    def _end_hand_single_winner(self):
+    def _end_hand_single_winner(self, players_in_hand: Optional[List[Player]] = None):
         """End hand when only one player remains (others folded)."""
-        players_in_hand = self.get_players_in_hand()
+        if players_in_hand is None:
+            players_in_hand = self.get_players_in_hand()
         if len(players_in_hand) == 1:
             winner = players_in_hand[0]
             total_won = sum(p.amount for p in self.pots)
@@ -850,14 +1102,15 @@ class Table:
             self._end_hand([winner.name])
         else:
             # Shouldn't happen, but handle gracefully
-            self._showdown()
+            self._showdown(players_in_hand)
 
-    def _showdown(self):
+    def _showdown(self, players_in_hand: Optional[List[Player]] = None):
         """Determine winner(s) and distribute pots."""
-        self.phase = GamePhase.SHOWDOWN
+        self._phase = PHASE_SHOWDOWN
         self.current_player_seat = None
 
-        players_in_hand = self.get_players_in_hand()
+        if players_in_hand is None:
+            players_in_hand = self.get_players_in_hand()
 
         if len(players_in_hand) == 1:
             # Only one player left
@@ -867,19 +1120,16 @@ class Table:
             self._end_hand([winner.name])
             return
 
-        # Evaluate all hands
+        # Evaluate all hands against one shared board key
+        community_key = HandEvaluator.community_key(self.community_cards)
         hand_results = []
         for player in players_in_hand:
             best_cards, rank, tiebreakers, desc = HandEvaluator.best_hand(
-                player.hole_cards, self.community_cards
+                player.hole_cards, self.community_cards, community_key
             )
-            hand_results.append({
-                'player': player,
-                'rank': rank,
-                'tiebreakers': tiebreakers,
-                'description': desc,
-                'best_cards': best_cards
-            })
+            hand_results.append(HandResult(
+                player, rank, HandEvaluator.score(rank, tiebreakers), desc, best_cards
+            ))
 
         # Distribute each pot
         all_winners = set()
@@ -888,37 +1138,31 @@ class Table:
                 continue
 
             # Find eligible players for this pot
+            eligible = pot.eligible_mask
             eligible_results = [
                 r for r in hand_results
-                if r['player'].name in pot.eligible_players
+                if eligible >> r.player.seat & 1
             ]
 
             if not eligible_results:
                 continue
 
             # Find best hand among eligible players
-            eligible_results.sort(
-                key=lambda x: (x['rank'], x['tiebreakers']),
-                reverse=True
-            )
-            best = (eligible_results[0]['rank'], eligible_results[0]['tiebreakers'])
-            pot_winners = [
-                r['player'] for r in eligible_results
-                if (r['rank'], r['tiebreakers']) == best
-            ]
+            best = max(r.score for r in eligible_results)
+            winners_mask = 0
+            for r in eligible_results:
+                if r.score == best:
+                    winners_mask |= 1 << r.player.seat
+                    all_winners.add(r.player.name)
 
             # Distribute pot among winners
-            share = pot.amount // len(pot_winners)
-            remainder = pot.amount % len(pot_winners)
-            for i, winner in enumerate(pot_winners):
-                winner.stack += share + (1 if i < remainder else 0)
-                all_winners.add(winner.name)
+            self._award_pot_share(pot.amount, winners_mask)
 
         self._end_hand(list(all_winners), hand_results)
 
-    def _end_hand(self, winners: List[str] = None, hand_results: List[dict] = None):
+    def _end_hand(self, winners: List[str] = None, hand_results: List[HandResult] = None):
         """End the current hand."""
-        self.phase = GamePhase.WAITING
+        self._phase = PHASE_WAITING
         self.current_player_seat = None
 
         # Calculate total pot for result
@@ -932,10 +1176,10 @@ class Table:
             'player_stacks': {p.name: p.stack for p in self.players.values()},
             'hand_results': [
                 {
-                    'player_name': r['player'].name,
-                    'rank': r['rank'],
-                    'description': r['description'],
-                    'best_cards': [c.to_dict() for c in r['best_cards']]
+                    'player_name': r.player.name,
+                    'rank': r.rank,
+                    'description': r.description,
+                    'best_cards': [c.to_dict() for c in r.best_cards]
                 }
                 for r in (hand_results or [])
             ] if hand_results else None
@@ -998,89 +1242,78 @@ class Table:
         - HJ: Hijack (2 seats before button)
         - CO: Cutoff (1 seat before button)
         """
+        return self._get_positions().get(seat, "")
+
+    def _get_positions(self) -> Dict[int, str]:
+        """Map every active seat to its position name.
+
+        Cached until the button moves or the set of active seats changes
+        (including sitting out / back in).
+        """
         if self.dealer_seat is None:
-            return ""
+            return {}
 
-        active_seats = sorted([
+        # SeatMap yields seats already in clockwise order
+        active_seats = tuple(
             s for s, p in self.players.items()
             if not p.is_sitting_out
-        ])
-
-        if not active_seats or seat not in active_seats:
-            return ""
-
-        num_players = len(active_seats)
-        if num_players < 2:
-            return ""
-
-        # Find dealer index in active seats
-        dealer_idx = active_seats.index(self.dealer_seat) if self.dealer_seat in active_seats else 0
-        seat_idx = active_seats.index(seat)
-
-        # Calculate position relative to dealer (0 = dealer, 1 = SB, 2 = BB, etc.)
-        relative_pos = (seat_idx - dealer_idx) % num_players
-
-        # Heads-up special case
-        if num_players == 2:
-            if relative_pos == 0:
-                return "BTN"  # Button is also SB in heads-up
-            else:
-                return "BB"
-
-        # 3+ players
-        if relative_pos == 0:
-            return "BTN"
-        elif relative_pos == 1:
-            return "SB"
-        elif relative_pos == 2:
-            return "BB"
-
-        # Positions after BB (counting from BB as position 0)
-        pos_after_bb = relative_pos - 2
-        positions_after_bb = num_players - 3  # Exclude BTN, SB, BB
-
-        if positions_after_bb <= 0:
-            return ""
-
-        # For different table sizes, assign position names
-        # Last position before BTN is CO, before that is HJ
-        if pos_after_bb == positions_after_bb:
-            return "CO"  # Cutoff (last before button)
-
-        if positions_after_bb >= 2 and pos_after_bb == positions_after_bb - 1:
-            return "HJ"  # Hijack (2nd last before button)
+        )
+        key = (self.dealer_seat, active_seats)
+        if key == self._position_key:
+            return self._position_cache
+
+        positions = {}
+        names = POSITION_NAMES.get(len(active_seats))
+        if names:
+            # Find dealer index in active seats
+            dealer_idx = active_seats.index(self.dealer_seat) if self.dealer_seat in active_seats else 0
+            num_players = len(active_seats)
+            for seat_idx, seat in enumerate(active_seats):
+                positions[seat] = names[(seat_idx - dealer_idx) % num_players]
+
+        self._position_key = key
+        self._position_cache = positions
+        return positions
 
-        # UTG positions (first positions after BB)
-        if pos_after_bb == 1:
-            return "UTG"
-        elif pos_after_bb == 2 and positions_after_bb >= 4:
-            return "UTG+1"
+    def get_game_state(self, for_player: str = None) -> dict:
+        """Get the current game state."""
+        state = self._get_public_state()
+        if for_player:
+            state = self.personalize_state(state, for_player)
+        return state
 
-        # Middle positions
-        if positions_after_bb >= 5 and pos_after_bb == 3:
-            return "MP"
-        if positions_after_bb >= 6 and pos_after_bb == 4:
-            return "MP+1"
+    def personalize_state(self, state: dict, for_player: str) -> dict:
+        """Return a public game state as for_player sees it.
 
-        # Fallback for edge cases
-        return f"MP"
+        Only the player's own entry (with hole cards) and the valid actions
+        are new; everything else is shared with state, so one public state
+        can be personalized for every connection.
+        """
+        state = dict(state)
+        player = self.get_player_by_name(for_player)
+        if player and player.hole_cards and self._phase != PHASE_SHOWDOWN:
+            players_data = state['players'] = list(state['players'])
+            for i, player_dict in enumerate(players_data):
+                if player_dict['name'] == for_player:
+                    player_dict = player.to_dict(show_cards=True)
+                    player_dict['position'] = players_data[i]['position']
+                    players_data[i] = player_dict
+                    break
+        state['valid_actions'] = self.get_valid_actions(for_player)
+        return state
 
-    def get_game_state(self, for_player: str = None) -> dict:
-        """Get the current game state."""
+    def _get_public_state(self) -> dict:
+        positions = self._get_positions()
+        show_cards = self._phase == PHASE_SHOWDOWN
         players_data = []
-        for seat in sorted(self.players.keys()):
-            player = self.players[seat]
-            show_cards = (
-                self.phase == GamePhase.SHOWDOWN or
-                (for_player and player.name == for_player)
-            )
+        for seat, player in self.players.items():
             player_dict = player.to_dict(show_cards=show_cards)
-            player_dict['position'] = self.get_position_name(seat)
+            player_dict['position'] = positions.get(seat, "")
             players_data.append(player_dict)
 
         state = {
             'room_id': self.room_id,
-            'phase': self.phase.value,
+            'phase': PHASE_VALUES[self._phase],
             'hand_number': self.hand_number,
             'pot': self.pot,
             'pots': [p.to_dict() for p in self.pots],
@@ -1096,17 +1329,27 @@ class Table:
             'max_buy_in': self.max_buy_in
         }
 
-        if for_player:
-            state['valid_actions'] = self.get_valid_actions(for_player)
-
-        if self._last_hand_result and self.phase == GamePhase.WAITING:
+        if self._last_hand_result and self._phase == PHASE_WAITING:
             state['last_hand_result'] = self._last_hand_result
 
         return state
 
     def get_action_history(self) -> List[dict]:
-        """Get the action history for current hand."""
-        return [a.to_dict() for a in self.action_history]
+        """Get the action history for current hand.
+
+        Actions are only ever appended within a hand, so the dict form is
+        cached and only the new entries are converted. start_hand replaces
+        the list, which resets the cache. The dicts are shared between
+        calls; the returned list is a fresh copy.
+        """
+        history = self.action_history
+        dicts = self._action_dicts
+        if self._action_dicts_source is not history or len(dicts) > len(history):
+            dicts = self._action_dicts = []
+            self._action_dicts_source = history
+        if len(dicts) < len(history):
+            dicts.extend(dict(zip(ACTION_FIELDS, a)) for a in history[len(dicts):])
+        return list(dicts)
 
     def serialize(self) -> dict:
         """Serialize table state to dict for persistence."""
@@ -1116,7 +1359,7 @@ class Table:
             'big_blind': self.big_blind,
             'min_buy_in': self.min_buy_in,
             'max_buy_in': self.max_buy_in,
-            'phase': self.phase.value,
+            'phase': PHASE_VALUES[self._phase],
             'dealer_seat': self.dealer_seat,
             'current_player_seat': self.current_player_seat,
             'last_aggressor_seat': self.last_aggressor_seat,
@@ -1124,8 +1367,11 @@ class Table:
             'last_raise_amount': self.last_raise_amount,
             'hand_number': self.hand_number,
             '_bb_has_option': self._bb_has_option,
+            '_heads_up': self._heads_up,
+            '_sb_seat': self._sb_seat,
+            '_bb_seat': self._bb_seat,
             'community_cards': [c.to_dict() for c in self.community_cards],
-            'pots': [{'amount': p.amount, 'eligible_players': p.eligible_players} for p in self.pots],
+            'pots': [p.to_dict() for p in self.pots],
             'players': {
                 str(seat): {
                     'name': p.name,
@@ -1140,7 +1386,7 @@ class Table:
                 }
                 for seat, p in self.players.items()
             },
-            'action_history': [a.to_dict() for a in self.action_history],
+            'action_history': self.get_action_history(),
             '_last_hand_result': self._last_hand_result
         }
 
@@ -1163,45 +1409,33 @@ class Table:
         table.last_raise_amount = data['last_raise_amount']
         table.hand_number = data['hand_number']
         table._bb_has_option = data.get('_bb_has_option', False)
+        table._heads_up = data.get('_heads_up')
+        table._any_all_in = any(p['is_all_in'] for p in data.get('players', {}).values())
+        table._sb_seat = data.get('_sb_seat')
+        table._bb_seat = data.get('_bb_seat')
         table._last_hand_result = data.get('_last_hand_result')
 
         # Restore community cards
         table.community_cards = [
-            Card(c['suit'], c['rank']) for c in data.get('community_cards', [])
+            Card.from_dict(c) for c in data.get('community_cards', [])
         ]
 
-        # Restore pots
+        # Restore pots (eligibility masks come from the saved seats)
+        seat_by_name = {
+            pdata['name']: pdata['seat'] for pdata in data.get('players', {}).values()
+        }
         table.pots = [
-            Pot(amount=p['amount'], eligible_players=p['eligible_players'])
+            Pot.from_dict(p, seat_by_name)
             for p in data.get('pots', [{'amount': 0, 'eligible_players': []}])
         ]
 
         # Restore players
         for seat_str, pdata in data.get('players', {}).items():
-            seat = int(seat_str)
-            player = Player(
-                name=pdata['name'],
-                seat=pdata['seat'],
-                stack=pdata['stack']
-            )
-            player.current_bet = pdata['current_bet']
-            player.total_bet = pdata['total_bet']
-            player.is_folded = pdata['is_folded']
-            player.is_all_in = pdata['is_all_in']
-            player.is_sitting_out = pdata['is_sitting_out']
-            player.hole_cards = [
-                Card(c['suit'], c['rank']) for c in pdata.get('hole_cards', [])
-            ]
-            table.players[seat] = player
+            table.players[int(seat_str)] = Player.from_dict(pdata)
 
         # Restore action history
         table.action_history = [
-            Action(
-                player_name=a['player'],
-                action_type=ActionType(a['action']),
-                amount=a['amount'],
-                phase=a['phase']
-            )
+            (a['player'], ActionType(a['action']).value, a['amount'], a['phase'])
             for a in data.get('action_history', [])
         ]
 
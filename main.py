@@ -3,8 +3,11 @@
 import uuid
 import json
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import Dict, Set, Optional
+from functools import partial
+from typing import Dict, List, Set, Optional
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
@@ -13,7 +16,7 @@ from pydantic import BaseModel
 
 from game.table import Table, GamePhase
 from database import init_db, HistoryManager
-from database.db import get_db, get_db_lock
+from database.db import get_db, close_db
 from models.schemas import RoomSettings, CreateRoomRequest, CreateRoomResponse
 import config
 
@@ -40,21 +43,41 @@ else:
 # Initialize database
 init_db()
 
+@dataclass(slots=True)
+class Room:
+    """A live room: its table plus the server state kept alongside it."""
+    table: Table
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)  # Serializes table access
+    connections: Dict[str, WebSocket] = field(default_factory=dict)  # player_name -> websocket
+    stacks_before_hand: Dict[str, int] = field(default_factory=dict)  # player_name -> stack
+    # player_name -> (websocket, state): the last game state each connection
+    # was sent, so send_game_state can send only what changed
+    sent_states: Dict[str, tuple] = field(default_factory=dict)
+
+
 # Room management with locks
-rooms: Dict[str, Table] = {}
-room_locks: Dict[str, asyncio.Lock] = {}  # Per-room locks for concurrent access
-room_connections: Dict[str, Dict[str, WebSocket]] = {}  # room_id -> {player_name: websocket}
-player_stacks_before_hand: Dict[str, Dict[str, int]] = {}  # room_id -> {player_name: stack}
+rooms: Dict[str, Room] = {}
+dirty_rooms: Set[str] = set()  # Rooms changed since their last persist, see flush_dirty_rooms
+pending_hands: List[dict] = []  # Finished hands not yet written, see flush_hand_records
 
 # Global lock for room creation/deletion
 rooms_global_lock = asyncio.Lock()
 
+# Room-state and hand-history SQLite work runs on one worker thread: commits don't stall the
+# event loop, and writes land in submission order, so an older state never
+# overwrites a newer one and a deleted room is not written back
+_room_db_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="room-db")
+
+
+async def _run_room_db(func, *args):
+    """Run a blocking database write or room query on the room DB thread."""
+    return await asyncio.get_running_loop().run_in_executor(_room_db_executor, func, *args)
+
 
-def get_room_lock(room_id: str) -> asyncio.Lock:
-    """Get or create a lock for a specific room."""
-    if room_id not in room_locks:
-        room_locks[room_id] = asyncio.Lock()
-    return room_locks[room_id]
+# Room states are persisted on every action; a reused compact encoder skips
+# per-call encoder setup and the circular-reference check (serialize()
+# output never contains cycles)
+_state_encoder = json.JSONEncoder(separators=(",", ":"), check_circular=False)
 
 
 class RoomManager:
@@ -76,10 +99,7 @@ class RoomManager:
                 max_buy_in=settings.max_buy_in
             )
 
-            rooms[room_id] = table
-            room_locks[room_id] = asyncio.Lock()
-            room_connections[room_id] = {}
-            player_stacks_before_hand[room_id] = {}
+            rooms[room_id] = Room(table)
 
             # Persist to database
             await RoomManager.persist_room(room_id)
@@ -88,47 +108,76 @@ class RoomManager:
 
     @staticmethod
     def get_room(room_id: str) -> Optional[Table]:
-        """Get a room by ID."""
-        return rooms.get(room_id)
+        """Get a room's table by ID."""
+        room = rooms.get(room_id)
+        return room.table if room else None
 
     @staticmethod
     async def delete_room(room_id: str):
         """Delete a room."""
         async with rooms_global_lock:
-            if room_id in rooms:
-                del rooms[room_id]
-            if room_id in room_locks:
-                del room_locks[room_id]
-            if room_id in room_connections:
-                del room_connections[room_id]
-            if room_id in player_stacks_before_hand:
-                del player_stacks_before_hand[room_id]
+            rooms.pop(room_id, None)
 
             # Remove from database
-            db_lock = get_db_lock()
-            with db_lock:
-                with get_db() as conn:
-                    conn.execute("DELETE FROM rooms WHERE room_id = ?", (room_id,))
-                    conn.commit()
+            await _run_room_db(RoomManager._delete_room_rows, [room_id])
+
+    @staticmethod
+    def mark_dirty(room_id: str):
+        """Schedule a room to be persisted by the next flush_dirty_rooms pass."""
+        dirty_rooms.add(room_id)
 
     @staticmethod
     async def persist_room(room_id: str):
         """Persist room state to database."""
-        table = rooms.get(room_id)
-        if not table:
-            return
+        await RoomManager.persist_rooms([room_id])
+
+    @staticmethod
+    async def persist_rooms(room_ids: List[str]):
+        """Persist several rooms' states in one transaction.
+
+        A room that fails to serialize is reported and skipped so it can't
+        hold back the others.
+        """
+        # Snapshot the tables on the event loop, where nothing else mutates
+        # them meanwhile; only the write itself leaves the loop
+        rows = []
+        for room_id in room_ids:
+            dirty_rooms.discard(room_id)
+            room = rooms.get(room_id)
+            if not room:
+                continue
+            try:
+                rows.append((room_id, _state_encoder.encode(room.table.serialize())))
+            except Exception as e:
+                print(f"Failed to persist room {room_id}: {e}")
 
-        state = table.serialize()
-        state_json = json.dumps(state)
+        if rows:
+            await _run_room_db(RoomManager._write_room_states, rows)
 
-        db_lock = get_db_lock()
-        with db_lock:
-            with get_db() as conn:
-                conn.execute('''
-                    INSERT OR REPLACE INTO rooms (room_id, state_json, updated_at)
-                    VALUES (?, ?, CURRENT_TIMESTAMP)
-                ''', (room_id, state_json))
-                conn.commit()
+    @staticmethod
+    def _write_room_states(rows: List[tuple]):
+        with get_db() as conn, conn:
+            conn.executemany('''
+                INSERT OR REPLACE INTO rooms (room_id, state_json, updated_at)
+                VALUES (?, ?, CURRENT_TIMESTAMP)
+            ''', rows)
+
+    @staticmethod
+    def _delete_room_rows(room_ids: List[str]):
+        with get_db() as conn, conn:
+            conn.execute(
+                f"DELETE FROM rooms WHERE room_id IN ({','.join('?' * len(room_ids))})",
+                room_ids
+            )
+
+    @staticmethod
+    def _find_old_room_ids(cutoff: datetime) -> List[str]:
+        with get_db() as conn:
+            cursor = conn.execute(
+                "SELECT room_id FROM rooms WHERE updated_at < ?",
+                (cutoff.isoformat(),)
+            )
+            return [row['room_id'] for row in cursor.fetchall()]
 
     @staticmethod
     async def load_rooms_from_db():
@@ -148,10 +197,7 @@ class RoomManager:
                         table = Table.deserialize(state)
                         room_id = row['room_id']
 
-                        rooms[room_id] = table
-                        room_locks[room_id] = asyncio.Lock()
-                        room_connections[room_id] = {}
-                        player_stacks_before_hand[room_id] = {}
+                        rooms[room_id] = Room(table)
 
                         print(f"Restored room {room_id}")
                     except Exception as e:
@@ -165,41 +211,21 @@ class RoomManager:
         # Find and remove old rooms from memory
         rooms_to_delete = []
         async with rooms_global_lock:
-            db_lock = get_db_lock()
-            with db_lock:
-                with get_db() as conn:
-                    # Find old rooms in database
-                    cursor = conn.execute(
-                        "SELECT room_id FROM rooms WHERE updated_at < ?",
-                        (cutoff.isoformat(),)
-                    )
-                    old_room_ids = [row['room_id'] for row in cursor.fetchall()]
-
-                    # Delete from database
-                    if old_room_ids:
-                        conn.execute(
-                            f"DELETE FROM rooms WHERE room_id IN ({','.join('?' * len(old_room_ids))})",
-                            old_room_ids
-                        )
-                        conn.commit()
-                        rooms_to_delete = old_room_ids
+            # Find old rooms in database
+            old_room_ids = await _run_room_db(RoomManager._find_old_room_ids, cutoff)
+
+            # Delete from database
+            if old_room_ids:
+                await _run_room_db(RoomManager._delete_room_rows, old_room_ids)
+                rooms_to_delete = old_room_ids
 
             # Clean up in-memory data
             for room_id in rooms_to_delete:
-                if room_id in rooms:
-                    del rooms[room_id]
-                if room_id in room_locks:
-                    del room_locks[room_id]
-                if room_id in room_connections:
+                room = rooms.pop(room_id, None)
+                if room:
                     # Close all connections in this room
-                    for ws in room_connections[room_id].values():
-                        try:
-                            await ws.close()
-                        except Exception:
-                            pass
-                    del room_connections[room_id]
-                if room_id in player_stacks_before_hand:
-                    del player_stacks_before_hand[room_id]
+                    for ws in room.connections.values():
+                        close_outbox(ws)
 
             if rooms_to_delete:
                 print(f"Cleaned up {len(rooms_to_delete)} inactive rooms")
@@ -209,11 +235,47 @@ async def periodic_persist():
     """Periodically persist all room states."""
     while True:
         await asyncio.sleep(config.ROOM_PERSIST_INTERVAL_SECONDS)
-        for room_id in list(rooms.keys()):
-            try:
-                await RoomManager.persist_room(room_id)
-            except Exception as e:
-                print(f"Failed to persist room {room_id}: {e}")
+        try:
+            await RoomManager.persist_rooms(list(rooms.keys()))
+        except Exception as e:
+            print(f"Failed to persist rooms: {e}")
+
+
+async def flush_dirty_rooms():
+    """Persist rooms marked dirty and finished hands, once per flush interval.
+
+    Actions within a street come in bursts; coalescing them turns one
+    SQLite write per action into one per room per interval.
+    """
+    while True:
+        await asyncio.sleep(config.ROOM_FLUSH_INTERVAL_MS / 1000)
+        await persist_dirty_rooms()
+        await flush_hand_records()
+
+
+async def flush_hand_records():
+    """Write every finished hand recorded since the last flush, in one transaction."""
+    if not pending_hands:
+        return
+    hands = pending_hands[:]
+    pending_hands.clear()
+    try:
+        await _run_room_db(HistoryManager.record_hands, hands)
+    except Exception as e:
+        # The batch is one transaction, so nothing was written; put it back
+        # ahead of newer hands for the next flush (or shutdown) to retry
+        pending_hands[:0] = hands
+        print(f"Failed to record hands: {e}")
+
+
+async def persist_dirty_rooms():
+    """Persist every room currently marked dirty, in one transaction."""
+    if not dirty_rooms:
+        return
+    try:
+        await RoomManager.persist_rooms(list(dirty_rooms))
+    except Exception as e:
+        print(f"Failed to persist rooms: {e}")
 
 
 async def periodic_cleanup():
@@ -226,71 +288,230 @@ async def periodic_cleanup():
             print(f"Failed to clean up rooms: {e}")
 
 
+_MISSING = object()
+
+
+def _encode_message(message: dict) -> str:
+    """Encode a message the way WebSocket.send_json would."""
+    return json.dumps(message, separators=(",", ":"), ensure_ascii=False)
+
+
+def _encode_batch(texts: list) -> str:
+    """Wrap already-encoded messages in one batch message."""
+    return '{"type":"batch","data":[' + ",".join(texts) + "]}"
+
+
+# Every connection's outgoing messages go through its own bounded queue,
+# drained in order by a writer task, so neither the game loop nor another
+# player's handler ever waits on a slow client.
+# websocket -> its outbox queue (encoded messages, then _CLOSE)
+_outboxes: Dict[WebSocket, asyncio.Queue] = {}
+_CLOSE = object()  # Outbox sentinel: close the socket after what's queued
+_DROP = object()  # Outbox sentinel: close a client that fell too far behind
+
+
+async def _outbox_writer(ws: WebSocket, queue: asyncio.Queue):
+    """Send a connection's queued messages in order, then close it."""
+    try:
+        while True:
+            # Whatever queued up while the last frame was being sent goes
+            # out together as one frame
+            batch = [await queue.get()]
+            while not queue.empty():
+                batch.append(queue.get_nowait())
+            last = batch[-1]
+            closing = last is _CLOSE or last is _DROP  # Nothing is queued after them
+            if closing:
+                batch.pop()
+            if len(batch) == 1:
+                await ws.send_text(batch[0])
+            elif batch:
+                await ws.send_text(_encode_batch(batch))
+            if closing:
+                break
+        # 1008 (policy violation) tells a dropped client why it was closed
+        await ws.close(code=1008 if last is _DROP else 1000)
+    except Exception:
+        pass  # The socket is gone; its receive loop handles the disconnect
+    finally:
+        if _outboxes.get(ws) is queue:
+            del _outboxes[ws]
+
+
+def open_outbox(ws: WebSocket) -> asyncio.Task:
+    """Start the outbox writer for a newly accepted connection."""
+    queue = asyncio.Queue(maxsize=config.WS_OUTBOX_SIZE)
+    _outboxes[ws] = queue
+    return asyncio.create_task(_outbox_writer(ws, queue))
+
+
+def close_outbox(ws: WebSocket):
+    """Close a connection once the messages already queued for it are sent."""
+    queue = _outboxes.pop(ws, None)
+    if queue is not None:
+        _queue_close(queue)
+
+
+def _queue_close(queue: asyncio.Queue, sentinel=_CLOSE):
+    if queue.full():
+        # Nobody will read the backlog of a client being dropped
+        while not queue.empty():
+            queue.get_nowait()
+    queue.put_nowait(sentinel)
+
+
+def _enqueue(ws: WebSocket, text: str) -> bool:
+    """Queue an encoded message for a connection; False if it can't take it.
+
+    A client whose outbox is full has fallen too far behind: it is
+    disconnected, and gets a full state when it reconnects.
+    """
+    queue = _outboxes.get(ws)
+    if queue is None:
+        return False
+    try:
+        queue.put_nowait(text)
+        return True
+    except asyncio.QueueFull:
+        del _outboxes[ws]
+        _queue_close(queue, _DROP)
+        return False
+
+
+def send_to(ws: WebSocket, message: dict) -> bool:
+    """Queue a message for one connection."""
+    return _enqueue(ws, _encode_message(message))
+
+
+def _send_all(room_id: str, sends: list) -> list:
+    """Queue (player_name, websocket, text) triples.
+
+    Returns whether each message was queued. Connections that can't take
+    one are dropped from the room.
+    """
+    results = [_enqueue(ws, text) for _, ws, text in sends]
+
+    room = rooms.get(room_id)
+    for (player_name, ws, _), queued in zip(sends, results):
+        if not queued and room and room.connections.get(player_name) is ws:
+            del room.connections[player_name]
+    return results
+
+
 async def broadcast_to_room(room_id: str, message: dict, exclude: str = None):
     """Broadcast a message to all players in a room."""
-    if room_id not in room_connections:
+    room = rooms.get(room_id)
+    if not room:
         return
 
-    for player_name, ws in list(room_connections[room_id].items()):
-        if exclude and player_name == exclude:
-            continue
-        try:
-            await ws.send_json(message)
-        except Exception:
-            pass
+    # Every recipient gets the same message, so encode it once
+    text = _encode_message(message)
+    _send_all(room_id, [
+        (player_name, ws, text)
+        for player_name, ws in room.connections.items()
+        if not (exclude and player_name == exclude)
+    ])
 
 
 async def send_game_state(room_id: str):
     """Send personalized game state to each player."""
-    table = rooms.get(room_id)
-    if not table:
+    room = rooms.get(room_id)
+    if not room:
         return
 
-    for player_name, ws in list(room_connections[room_id].items()):
-        try:
-            state = table.get_game_state(for_player=player_name)
-            await ws.send_json({
-                'type': 'game_state',
-                'data': state
-            })
-        except Exception:
-            pass
+    # Build every player's state first, then send them all at once.
+    # The public part is built once and shared by all of them.
+    table = room.table
+    public_state = table.get_game_state()
+    sent = room.sent_states
+    states = []
+    sends = []
+    for player_name, ws in room.connections.items():
+        state = table.personalize_state(public_state, player_name)
+        states.append(state)
+        sends.append((player_name, ws, _encode_message(
+            _game_state_message(state, sent.get(player_name), ws)
+        )))
+
+    results = _send_all(room_id, sends)
+
+    # Only a queued state can be the base for the next patch
+    for (player_name, ws, _), state, queued in zip(sends, states, results):
+        if queued:
+            sent[player_name] = (ws, state)
+        else:
+            sent.pop(player_name, None)
+
+
+def _game_state_message(state: dict, previous: Optional[tuple], ws: WebSocket) -> dict:
+    """Build a full game_state, or a state_patch against the last state sent.
+
+    The patch lists the top-level keys whose values changed ('set') and
+    the keys that are gone ('unset'); the client merges it into its
+    current state. A new connection always gets the full state.
+    """
+    if previous is None or previous[0] is not ws:
+        return {'type': 'game_state', 'data': state}
+
+    prev_state = previous[1]
+    return {'type': 'state_patch', 'data': {
+        'set': {k: v for k, v in state.items() if prev_state.get(k, _MISSING) != v},
+        'unset': [k for k in prev_state if k not in state]
+    }}
+
+
+def forget_sent_state(room_id: str, player_name: str):
+    """Make the next send_game_state send this player a full state.
+
+    Needed whenever a game state reaches the player some other way.
+    """
+    room = rooms.get(room_id)
+    if room:
+        room.sent_states.pop(player_name, None)
 
 
 def record_hand_result(room_id: str, table: Table):
-    """Record hand result to database."""
-    if not hasattr(table, '_last_hand_result'):
-        return
+    """Queue a finished hand to be written to the hand history.
 
+    A hand without a result or without winners is not recorded.
+    """
     result = table._last_hand_result
+    if not result:
+        return
+
     winners = result.get('winners', [])
+    if not winners:
+        return
     pot = result.get('pot', 0)
 
     # Calculate player results
     player_results = []
-    stacks_before = player_stacks_before_hand.get(room_id, {})
+    room = rooms.get(room_id)
+    stacks_before = room.stacks_before_hand if room else {}
+    winner_names = set(winners)
 
     for player in table.players.values():
-        starting = stacks_before.get(player.name, player.stack)
-        profit = player.stack - starting
+        name = player.name
+        stack = player.stack
+        starting = stacks_before.get(name, stack)
         player_results.append({
-            'player_name': player.name,
+            'player_name': name,
             'starting_stack': starting,
-            'ending_stack': player.stack,
-            'profit': profit,
-            'is_winner': player.name in winners,
-            'hole_cards': [c.to_dict() for c in player.hole_cards] if player.hole_cards else []
+            'ending_stack': stack,
+            'profit': stack - starting,
+            'is_winner': name in winner_names,
+            'hole_cards': [c.to_dict() for c in player.hole_cards]
         })
 
-    # Record to database
-    HistoryManager.record_hand(
-        room_id=room_id,
-        hand_number=table.hand_number,
-        pot_size=pot,
-        winners=winners,
-        actions=table.get_action_history(),
-        player_results=player_results
-    )
+    # Written to the database by the next flush_hand_records pass
+    pending_hands.append({
+        'room_id': room_id,
+        'hand_number': table.hand_number,
+        'pot_size': pot,
+        'winners': winners,
+        'actions': table.get_action_history(),
+        'player_results': player_results
+    })
 
 
 # Startup event
@@ -299,6 +520,7 @@ async def startup_event():
     """Load persisted rooms and start background tasks."""
     await RoomManager.load_rooms_from_db()
     asyncio.create_task(periodic_persist())
+    asyncio.create_task(flush_dirty_rooms())
     asyncio.create_task(periodic_cleanup())
     print(f"BerryPoker server starting on {config.HOST}:{config.PORT}")
     print(f"Rooms inactive for {config.ROOM_CLEANUP_HOURS}h will be deleted")
@@ -306,6 +528,14 @@ async def startup_event():
         print("Running in PRODUCTION mode")
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Write out pending room changes and hands, then close pooled database connections."""
+    await persist_dirty_rooms()
+    await flush_hand_records()
+    close_db()
+
+
 # REST API Endpoints
 @app.post("/api/rooms", response_model=CreateRoomResponse)
 async def create_room(request: CreateRoomRequest = None):
@@ -325,9 +555,9 @@ async def get_room_info(room_id: str):
 
 
 @app.get("/api/rooms/{room_id}/history")
-async def get_room_history(room_id: str, limit: int = 50):
+async def get_room_history(room_id: str, limit: int = 50, include_actions: bool = False):
     """Get hand history for a room."""
-    return HistoryManager.get_hand_history(room_id, limit)
+    return HistoryManager.get_hand_history(room_id, limit, include_actions)
 
 
 @app.get("/api/hands/{hand_id}")
@@ -360,383 +590,418 @@ async def health_check():
     return {"status": "healthy", "rooms": len(rooms)}
 
 
-# WebSocket endpoint
-@app.websocket("/ws/{room_id}")
-async def websocket_endpoint(websocket: WebSocket, room_id: str):
-    """WebSocket connection for real-time game updates."""
-    await websocket.accept()
+# WebSocket message handlers
+def _encode_error(message: str) -> str:
+    return _encode_message({'type': 'error', 'data': {'message': message}})
+
+
+# Errors the handlers send as-is, encoded once
+ERR_NAME_REQUIRED = _encode_error('Player name is required')
+ERR_NAME_IN_ROOM = _encode_error('Name already in use in this room')
+ERR_NO_SEAT = _encode_error('Please select a seat')
+ERR_NAME_SEATED = _encode_error('This name is already seated at another position')
+ERR_NAME_IN_USE = _encode_error('This name is already in use')
+ERR_SEAT_TAKEN = _encode_error('Seat is taken or table is full')
+ERR_GAME_IN_PROGRESS = _encode_error('Game already in progress')
+ERR_NOT_ENOUGH_PLAYERS = _encode_error('Need at least 2 players to start')
+ERR_NOT_JOINED = _encode_error('Not joined')
+
+
+@dataclass(slots=True)
+class Connection:
+    """State of one room WebSocket connection, shared by its handlers."""
+    websocket: WebSocket
+    room_id: str
+    room: Room
+    player_name: Optional[str] = None
+    is_seated: bool = False  # Track if player has chosen a seat
+    spectator_name: Optional[str] = None  # Name for spectators (not seated)
+
+    @property
+    def table(self) -> Table:
+        return self.room.table
+
+
+async def handle_spectate(conn: Connection, msg_data: dict):
+    """Player enters room as spectator (can see table, choose seat)."""
+    websocket, room_id, table = conn.websocket, conn.room_id, conn.table
+    name = msg_data.get('player_name', '').strip()
+    if not name:
+        _enqueue(websocket, ERR_NAME_REQUIRED)
+        return
 
-    table = RoomManager.get_room(room_id)
-    if not table:
-        await websocket.send_json({'type': 'error', 'data': {'message': 'Room not found'}})
-        await websocket.close()
+    async with conn.room.lock:
+        # Check if already seated (reconnecting)
+        existing = table.get_player_by_name(name)
+        if existing:
+            conn.player_name = name
+            conn.spectator_name = name
+            conn.is_seated = True
+            conn.room.connections[name] = websocket
+            send_to(websocket, {
+                'type': 'joined',
+                'data': {'player_name': name, 'seat': existing.seat}
+            })
+        else:
+            # Check if name is already used by another active connection
+            if name in conn.room.connections:
+                _enqueue(websocket, ERR_NAME_IN_ROOM)
+                return True
+
+            conn.spectator_name = name
+            # Register in the room's connections so signaling messages can reach spectators
+            conn.room.connections[name] = websocket
+            # Send spectating confirmation
+            send_to(websocket, {
+                'type': 'spectating',
+                'data': {'player_name': name}
+            })
+
+        # Send current game state
+        forget_sent_state(room_id, conn.spectator_name)
+        state = table.get_game_state()
+        state['spectator_name'] = conn.spectator_name
+        send_to(websocket, {
+            'type': 'game_state',
+            'data': state
+        })
+
+
+async def handle_join(conn: Connection, msg_data: dict):
+    """Player choosing a seat."""
+    websocket, room_id, table = conn.websocket, conn.room_id, conn.table
+    name = msg_data.get('player_name', '').strip() or conn.spectator_name
+    stack = msg_data.get('stack', 100)
+    seat = msg_data.get('seat')
+
+    if not name:
+        _enqueue(websocket, ERR_NAME_REQUIRED)
         return
 
-    # Get the lock for this room
-    room_lock = get_room_lock(room_id)
+    if seat is None:
+        _enqueue(websocket, ERR_NO_SEAT)
+        return
 
-    player_name = None
-    is_seated = False  # Track if player has chosen a seat
-    spectator_name = None  # Name for spectators (not seated)
+    async with conn.room.lock:
+        # Check if name is already taken by another seated player
+        existing = table.get_player_by_name(name)
+        if existing:
+            # Name exists in table
+            if existing.seat != seat:
+                # Trying to sit at different seat with same name
+                _enqueue(websocket, ERR_NAME_SEATED)
+                return
+            # Reconnecting to same seat - allowed
+            conn.player_name = name
+            conn.is_seated = True
+            conn.room.connections[name] = websocket
+        else:
+            # Check if someone else is using this name as spectator
+            if name in conn.room.connections and name != conn.spectator_name:
+                _enqueue(websocket, ERR_NAME_IN_USE)
+                return
+
+            # New player taking a seat
+            player = table.add_player(name, stack, seat)
+            if not player:
+                _enqueue(websocket, ERR_SEAT_TAKEN)
+                return
+
+            conn.player_name = name
+            conn.is_seated = True
+            conn.room.connections[name] = websocket
+
+        send_to(websocket, {
+            'type': 'joined',
+            'data': {'player_name': name, 'seat': seat}
+        })
 
-    try:
-        while True:
-            data = await websocket.receive_json()
-            msg_type = data.get('type')
-            msg_data = data.get('data', {})
-
-            if msg_type == 'spectate':
-                # Player enters room as spectator (can see table, choose seat)
-                name = msg_data.get('player_name', '').strip()
-                if not name:
-                    await websocket.send_json({
-                        'type': 'error',
-                        'data': {'message': 'Player name is required'}
-                    })
-                    continue
-
-                async with room_lock:
-                    # Check if already seated (reconnecting)
-                    existing = table.get_player_by_name(name)
-                    if existing:
-                        player_name = name
-                        spectator_name = name
-                        is_seated = True
-                        room_connections[room_id][player_name] = websocket
-                        await websocket.send_json({
-                            'type': 'joined',
-                            'data': {'player_name': player_name, 'seat': existing.seat}
-                        })
-                    else:
-                        # Check if name is already used by another active connection
-                        if name in room_connections[room_id]:
-                            await websocket.send_json({
-                                'type': 'error',
-                                'data': {'message': 'Name already in use in this room'}
-                            })
-                            await websocket.close()
-                            return
-
-                        spectator_name = name
-                        # Register in room_connections so signaling messages can reach spectators
-                        room_connections[room_id][name] = websocket
-                        # Send spectating confirmation
-                        await websocket.send_json({
-                            'type': 'spectating',
-                            'data': {'player_name': name}
-                        })
-
-                    # Send current game state
-                    state = table.get_game_state()
-                    state['spectator_name'] = spectator_name
-                    await websocket.send_json({
-                        'type': 'game_state',
-                        'data': state
-                    })
+    # Broadcast player update (outside lock to avoid deadlock)
+    await broadcast_to_room(room_id, {
+        'type': 'player_joined',
+        'data': {'player_name': name, 'seat': seat}
+    }, exclude=name)
+
+    # Send game state to all
+    await send_game_state(room_id)
+
+    # Persist room state
+    RoomManager.mark_dirty(room_id)
+
+
+async def handle_leave(conn: Connection, msg_data: dict):
+    """Player leaving seat (but may stay as spectator)."""
+    room_id = conn.room_id
+    leaving_name = conn.player_name
+    async with conn.room.lock:
+        if leaving_name:
+            conn.table.remove_player(leaving_name)
+            # Don't remove from the room's connections - they stay as spectator
+            conn.is_seated = False
+
+    if leaving_name:
+        await broadcast_to_room(room_id, {
+            'type': 'player_left',
+            'data': {'player_name': leaving_name}
+        })
+        await send_game_state(room_id)
+        RoomManager.mark_dirty(room_id)
 
-            elif msg_type == 'join':
-                # Player choosing a seat
-                name = msg_data.get('player_name', '').strip() or spectator_name
-                stack = msg_data.get('stack', 100)
-                seat = msg_data.get('seat')
+    # Player becomes spectator, keep name for potential rejoin
+    conn.player_name = None
+    # spectator_name remains set so they can rejoin
 
-                if not name:
-                    await websocket.send_json({
-                        'type': 'error',
-                        'data': {'message': 'Player name is required'}
-                    })
-                    continue
 
-                if seat is None:
-                    await websocket.send_json({
-                        'type': 'error',
-                        'data': {'message': 'Please select a seat'}
-                    })
-                    continue
-
-                async with room_lock:
-                    # Check if name is already taken by another seated player
-                    existing = table.get_player_by_name(name)
-                    if existing:
-                        # Name exists in table
-                        if existing.seat != seat:
-                            # Trying to sit at different seat with same name
-                            await websocket.send_json({
-                                'type': 'error',
-                                'data': {'message': 'This name is already seated at another position'}
-                            })
-                            continue
-                        # Reconnecting to same seat - allowed
-                        player_name = name
-                        is_seated = True
-                        room_connections[room_id][player_name] = websocket
-                    else:
-                        # Check if someone else is using this name as spectator
-                        if name in room_connections[room_id] and name != spectator_name:
-                            await websocket.send_json({
-                                'type': 'error',
-                                'data': {'message': 'This name is already in use'}
-                            })
-                            continue
-
-                        # New player taking a seat
-                        player = table.add_player(name, stack, seat)
-                        if not player:
-                            await websocket.send_json({
-                                'type': 'error',
-                                'data': {'message': 'Seat is taken or table is full'}
-                            })
-                            continue
-
-                        player_name = name
-                        is_seated = True
-                        room_connections[room_id][player_name] = websocket
-
-                    await websocket.send_json({
-                        'type': 'joined',
-                        'data': {'player_name': player_name, 'seat': seat}
-                    })
+async def handle_start_game(conn: Connection, msg_data: dict):
+    """Start a new hand."""
+    websocket, room_id, table = conn.websocket, conn.room_id, conn.table
+    async with conn.room.lock:
+        if table.phase != GamePhase.WAITING:
+            _enqueue(websocket, ERR_GAME_IN_PROGRESS)
+            return
 
-                # Broadcast player update (outside lock to avoid deadlock)
-                await broadcast_to_room(room_id, {
-                    'type': 'player_joined',
-                    'data': {'player_name': player_name, 'seat': seat}
-                }, exclude=player_name)
-
-                # Send game state to all
-                await send_game_state(room_id)
-
-                # Persist room state
-                await RoomManager.persist_room(room_id)
-
-            elif msg_type == 'leave':
-                # Player leaving seat (but may stay as spectator)
-                leaving_name = player_name
-                async with room_lock:
-                    if player_name:
-                        table.remove_player(player_name)
-                        # Don't remove from room_connections - they stay as spectator
-                        is_seated = False
-
-                if leaving_name:
-                    await broadcast_to_room(room_id, {
-                        'type': 'player_left',
-                        'data': {'player_name': leaving_name}
-                    })
-                    await send_game_state(room_id)
-                    await RoomManager.persist_room(room_id)
-
-                # Player becomes spectator, keep name for potential rejoin
-                player_name = None
-                # spectator_name remains set so they can rejoin
-
-            elif msg_type == 'start_game':
-                # Start a new hand
-                async with room_lock:
-                    if table.phase != GamePhase.WAITING:
-                        await websocket.send_json({
-                            'type': 'error',
-                            'data': {'message': 'Game already in progress'}
-                        })
-                        continue
-
-                    # Store stacks before hand
-                    player_stacks_before_hand[room_id] = {
-                        p.name: p.stack for p in table.players.values()
-                    }
-
-                    if table.start_hand():
-                        await broadcast_to_room(room_id, {
-                            'type': 'hand_started',
-                            'data': {'hand_number': table.hand_number}
-                        })
-                        await send_game_state(room_id)
-                        await RoomManager.persist_room(room_id)
-                    else:
-                        await websocket.send_json({
-                            'type': 'error',
-                            'data': {'message': 'Need at least 2 players to start'}
-                        })
-
-            elif msg_type == 'action':
-                # Player action
-                if not player_name:
-                    await websocket.send_json({
-                        'type': 'error',
-                        'data': {'message': 'Not joined'}
-                    })
-                    continue
+        # Store stacks before hand
+        conn.room.stacks_before_hand = {
+            p.name: p.stack for p in table.players.values()
+        }
 
-                action = msg_data.get('action')
-                amount = msg_data.get('amount', 0)
+        if table.start_hand():
+            await broadcast_to_room(room_id, {
+                'type': 'hand_started',
+                'data': {'hand_number': table.hand_number}
+            })
+            await send_game_state(room_id)
+            RoomManager.mark_dirty(room_id)
+        else:
+            _enqueue(websocket, ERR_NOT_ENOUGH_PLAYERS)
+
+
+async def handle_action(conn: Connection, msg_data: dict):
+    """Player action."""
+    websocket, room_id, table = conn.websocket, conn.room_id, conn.table
+    player_name = conn.player_name
+    if not player_name:
+        _enqueue(websocket, ERR_NOT_JOINED)
+        return
 
-                async with room_lock:
-                    result = table.process_action(player_name, action, amount)
+    action = msg_data.get('action')
+    amount = msg_data.get('amount', 0)
 
-                    if not result['success']:
-                        await websocket.send_json({
-                            'type': 'error',
-                            'data': {'message': result.get('error', 'Invalid action')}
-                        })
-                        continue
+    async with conn.room.lock:
+        result = table.process_action(player_name, action, amount)
 
-                    # Broadcast action
-                    await broadcast_to_room(room_id, {
-                        'type': 'player_action',
-                        'data': {
-                            'player_name': player_name,
-                            'action': action,
-                            'amount': amount
-                        }
-                    })
+        if not result['success']:
+            send_to(websocket, {
+                'type': 'error',
+                'data': {'message': result.get('error', 'Invalid action')}
+            })
+            return
+
+        # Broadcast action
+        await broadcast_to_room(room_id, {
+            'type': 'player_action',
+            'data': {
+                'player_name': player_name,
+                'action': action,
+                'amount': amount
+            }
+        })
 
-                    # Check if waiting for run-twice choice
-                    if table.phase == GamePhase.WAITING_RUN_TWICE:
-                        # Send prompt to eligible players
-                        for eligible_player in table._run_twice_players:
-                            if eligible_player in room_connections[room_id]:
-                                try:
-                                    await room_connections[room_id][eligible_player].send_json({
-                                        'type': 'run_twice_prompt',
-                                        'data': {
-                                            'eligible_players': table._run_twice_players
-                                        }
-                                    })
-                                except Exception:
-                                    pass
-
-                    # Check if hand ended
-                    elif table.phase == GamePhase.WAITING:
-                        # Record hand result
-                        record_hand_result(room_id, table)
-
-                        await broadcast_to_room(room_id, {
-                            'type': 'hand_ended',
-                            'data': table._last_hand_result if hasattr(table, '_last_hand_result') else {}
-                        })
-
-                    await send_game_state(room_id)
-                    await RoomManager.persist_room(room_id)
-
-            elif msg_type == 'chat':
-                # Chat message
-                if player_name:
-                    await broadcast_to_room(room_id, {
-                        'type': 'chat',
+        # Check if waiting for run-twice choice
+        if table.phase == GamePhase.WAITING_RUN_TWICE:
+            # Send prompt to eligible players
+            for eligible_player in table._run_twice_players:
+                if eligible_player in conn.room.connections:
+                    send_to(conn.room.connections[eligible_player], {
+                        'type': 'run_twice_prompt',
                         'data': {
-                            'player_name': player_name,
-                            'message': msg_data.get('message', '')
+                            'eligible_players': table._run_twice_players
                         }
                     })
 
-            elif msg_type in ('webrtc_offer', 'webrtc_answer', 'webrtc_ice'):
-                # WebRTC signaling relay — forward to target player
-                target = msg_data.get('target')
-                sender = player_name or spectator_name
-                if target and sender and room_id in room_connections:
-                    target_ws = room_connections[room_id].get(target)
-                    if target_ws:
-                        try:
-                            await target_ws.send_json({
-                                'type': msg_type,
-                                'data': {**msg_data, 'from': sender}
-                            })
-                        except Exception:
-                            pass
-
-            elif msg_type == 'sit_out':
-                # Toggle sit out
-                async with room_lock:
-                    if player_name:
-                        player = table.get_player_by_name(player_name)
-                        if player:
-                            player.is_sitting_out = not player.is_sitting_out
-                            await send_game_state(room_id)
-                            await RoomManager.persist_room(room_id)
-
-            elif msg_type == 'add_chips':
-                # Add chips to stack (between hands only)
-                async with room_lock:
-                    if player_name and table.phase == GamePhase.WAITING:
-                        player = table.get_player_by_name(player_name)
-                        if player:
-                            add_amount = msg_data.get('amount', 0)
-                            new_total = player.stack + add_amount
-                            if new_total <= table.max_buy_in:
-                                player.stack = new_total
-                                await send_game_state(room_id)
-                                await RoomManager.persist_room(room_id)
-                            else:
-                                await websocket.send_json({
-                                    'type': 'error',
-                                    'data': {'message': f'Max stack is {table.max_buy_in}'}
-                                })
-
-            elif msg_type == 'run_twice_choice':
-                # Handle run-it-twice choice
-                if not player_name:
-                    await websocket.send_json({
+        # Check if hand ended
+        elif table.phase == GamePhase.WAITING:
+            # Record hand result
+            record_hand_result(room_id, table)
+
+            await broadcast_to_room(room_id, {
+                'type': 'hand_ended',
+                'data': table._last_hand_result or {}
+            })
+
+        await send_game_state(room_id)
+        RoomManager.mark_dirty(room_id)
+
+
+async def handle_chat(conn: Connection, msg_data: dict):
+    """Chat message."""
+    if conn.player_name:
+        await broadcast_to_room(conn.room_id, {
+            'type': 'chat',
+            'data': {
+                'player_name': conn.player_name,
+                'message': msg_data.get('message', '')
+            }
+        })
+
+
+async def handle_webrtc_signal(conn: Connection, msg_data: dict, msg_type: str):
+    """WebRTC signaling relay — forward to target player."""
+    target = msg_data.get('target')
+    sender = conn.player_name or conn.spectator_name
+    if target and sender:
+        target_ws = conn.room.connections.get(target)
+        if target_ws:
+            send_to(target_ws, {
+                'type': msg_type,
+                'data': {**msg_data, 'from': sender}
+            })
+
+
+async def handle_sit_out(conn: Connection, msg_data: dict):
+    """Toggle sit out."""
+    async with conn.room.lock:
+        if conn.player_name:
+            player = conn.table.get_player_by_name(conn.player_name)
+            if player:
+                player.is_sitting_out = not player.is_sitting_out
+                await send_game_state(conn.room_id)
+                RoomManager.mark_dirty(conn.room_id)
+
+
+async def handle_add_chips(conn: Connection, msg_data: dict):
+    """Add chips to stack (between hands only)."""
+    table = conn.table
+    async with conn.room.lock:
+        if conn.player_name and table.phase == GamePhase.WAITING:
+            player = table.get_player_by_name(conn.player_name)
+            if player:
+                add_amount = msg_data.get('amount', 0)
+                new_total = player.stack + add_amount
+                if new_total <= table.max_buy_in:
+                    player.stack = new_total
+                    await send_game_state(conn.room_id)
+                    RoomManager.mark_dirty(conn.room_id)
+                else:
+                    send_to(conn.websocket, {
                         'type': 'error',
-                        'data': {'message': 'Not joined'}
+                        'data': {'message': f'Max stack is {table.max_buy_in}'}
                     })
-                    continue
 
-                wants_twice = msg_data.get('run_twice', False)
 
-                async with room_lock:
-                    result = table.process_run_twice_choice(player_name, wants_twice)
+async def handle_run_twice_choice(conn: Connection, msg_data: dict):
+    """Handle run-it-twice choice."""
+    websocket, room_id, table = conn.websocket, conn.room_id, conn.table
+    player_name = conn.player_name
+    if not player_name:
+        _enqueue(websocket, ERR_NOT_JOINED)
+        return
 
-                    if not result['success']:
-                        await websocket.send_json({
-                            'type': 'error',
-                            'data': {'message': result.get('error', 'Invalid choice')}
-                        })
-                        continue
+    wants_twice = msg_data.get('run_twice', False)
 
-                    # Broadcast choice made
-                    await broadcast_to_room(room_id, {
-                        'type': 'run_twice_choice_made',
-                        'data': {
-                            'player_name': player_name,
-                            'wants_twice': wants_twice,
-                            'waiting_for': [p for p in table._run_twice_players
-                                          if p not in table._run_twice_choices]
-                        }
-                    })
+    async with conn.room.lock:
+        result = table.process_run_twice_choice(player_name, wants_twice)
+
+        if not result['success']:
+            send_to(websocket, {
+                'type': 'error',
+                'data': {'message': result.get('error', 'Invalid choice')}
+            })
+            return
+
+        # Broadcast choice made
+        await broadcast_to_room(room_id, {
+            'type': 'run_twice_choice_made',
+            'data': {
+                'player_name': player_name,
+                'wants_twice': wants_twice,
+                'waiting_for': [p for p in table._run_twice_players
+                              if p not in table._run_twice_choices]
+            }
+        })
 
-                    # Check if hand ended (all choices made)
-                    if table.phase == GamePhase.WAITING:
-                        # Record hand result
-                        record_hand_result(room_id, table)
+        # Check if hand ended (all choices made)
+        if table.phase == GamePhase.WAITING:
+            # Record hand result
+            record_hand_result(room_id, table)
+
+            await broadcast_to_room(room_id, {
+                'type': 'hand_ended',
+                'data': table._last_hand_result or {}
+            })
+
+        await send_game_state(room_id)
+        RoomManager.mark_dirty(room_id)
+
+
+# msg_type -> handler(conn, msg_data). A handler returns True to end the
+# connection; unknown message types are ignored.
+MESSAGE_HANDLERS = {
+    'spectate': handle_spectate,
+    'join': handle_join,
+    'leave': handle_leave,
+    'start_game': handle_start_game,
+    'action': handle_action,
+    'chat': handle_chat,
+    'webrtc_offer': partial(handle_webrtc_signal, msg_type='webrtc_offer'),
+    'webrtc_answer': partial(handle_webrtc_signal, msg_type='webrtc_answer'),
+    'webrtc_ice': partial(handle_webrtc_signal, msg_type='webrtc_ice'),
+    'sit_out': handle_sit_out,
+    'add_chips': handle_add_chips,
+    'run_twice_choice': handle_run_twice_choice,
+}
+
+
+def _drop_connection(conn: Connection):
+    """Forget a closed connection's registration in its room."""
+    disconnect_name = conn.player_name or conn.spectator_name
+    room = conn.room
+    if disconnect_name and rooms.get(conn.room_id) is room:
+        room.connections.pop(disconnect_name, None)
+        room.sent_states.pop(disconnect_name, None)
+        return True
+    return False
 
-                        await broadcast_to_room(room_id, {
-                            'type': 'hand_ended',
-                            'data': table._last_hand_result if hasattr(table, '_last_hand_result') else {}
-                        })
 
-                    await send_game_state(room_id)
-                    await RoomManager.persist_room(room_id)
+# WebSocket endpoint
+@app.websocket("/ws/{room_id}")
+async def websocket_endpoint(websocket: WebSocket, room_id: str):
+    """WebSocket connection for real-time game updates."""
+    await websocket.accept()
+
+    room = rooms.get(room_id)
+    if not room:
+        await websocket.send_json({'type': 'error', 'data': {'message': 'Room not found'}})
+        await websocket.close()
+        return
+
+    conn = Connection(websocket, room_id, room)
+    writer = open_outbox(websocket)
+
+    try:
+        while True:
+            data = await websocket.receive_json()
+            handler = MESSAGE_HANDLERS.get(data.get('type'))
+            if handler is not None and await handler(conn, data.get('data', {})):
+                return
 
     except WebSocketDisconnect:
         # Handle disconnect — clean up both seated players and spectators
-        disconnect_name = player_name or spectator_name
-        if disconnect_name and room_id in room_connections:
-            if disconnect_name in room_connections[room_id]:
-                del room_connections[room_id][disconnect_name]
-
-            if player_name:
-                # Don't remove player from table immediately (allow reconnect)
-                await broadcast_to_room(room_id, {
-                    'type': 'player_disconnected',
-                    'data': {'player_name': player_name}
-                })
+        if _drop_connection(conn) and conn.player_name:
+            # Don't remove player from table immediately (allow reconnect)
+            await broadcast_to_room(room_id, {
+                'type': 'player_disconnected',
+                'data': {'player_name': conn.player_name}
+            })
 
     except Exception as e:
         print(f"WebSocket error: {e}")
-        disconnect_name = player_name or spectator_name
-        if disconnect_name and room_id in room_connections:
-            if disconnect_name in room_connections[room_id]:
-                del room_connections[room_id][disconnect_name]
+        _drop_connection(conn)
+
+    finally:
+        # Send whatever is still queued for this connection, then close it
+        close_outbox(websocket)
+        await writer
 
 
 # Serve static files
@@ -90,8 +90,8 @@ class HandRecord(BaseModel):
     room_id: str
     hand_number: int
     pot_size: int
-    winner_names: str
-    actions: str
+    winners: List[str]
+    actions: Optional[List[ActionHistoryItem]] = None
     created_at: str
 
 
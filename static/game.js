@@ -317,6 +317,13 @@ class PokerGame {
 
     handleMessage(message) {
         switch (message.type) {
+            case 'batch':
+                // Messages queued together on the server, in order
+                for (const queued of message.data) {
+                    this.handleMessage(queued);
+                }
+                break;
+
             case 'spectating':
                 this.isSeated = false;
                 this.isSpectating = true;
@@ -363,6 +370,17 @@ class PokerGame {
                 this.updateGameState(message.data);
                 break;
 
+            case 'state_patch':
+                // Only the top-level keys that changed since the last state
+                if (this.gameState) {
+                    const state = Object.assign({}, this.gameState, message.data.set);
+                    for (const key of message.data.unset) {
+                        delete state[key];
+                    }
+                    this.updateGameState(state);
+                }
+                break;
+
             case 'player_joined':
                 this.showToast(`${message.data.player_name} joined the game`, 'info');
                 this.addActionToCurrentHand(`${message.data.player_name} joined`, 'info');
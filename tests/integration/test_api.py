@@ -2,7 +2,10 @@
 
 import os
 import pytest
+import sqlite3
 import tempfile
+from collections import deque
+from contextlib import contextmanager
 from pathlib import Path
 from fastapi.testclient import TestClient
 
@@ -23,7 +26,8 @@ def test_db():
 
     yield test_db_path
 
-    # Cleanup
+    # Cleanup - close pooled connections so WAL side files are removed
+    db_module.close_db()
     db_module.DATABASE_PATH = original_path
     if test_db_path.exists():
         os.remove(test_db_path)
@@ -32,9 +36,44 @@ def test_db():
 
 @pytest.fixture
 def client(test_db):
-    """Create a test client."""
+    """Create a test client.
+
+    Used as a context manager so every WebSocket session shares one event
+    loop; otherwise each session gets its own loop and broadcasts between
+    sessions can lose their wakeup.
+    """
     from main import app
-    return TestClient(app)
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+class UnbatchingSocket:
+    """Test WebSocket that hands out the messages of a batch one by one."""
+
+    def __init__(self, ws):
+        self.ws = ws
+        self.frames = []
+        self.pending = deque()
+
+    def send_json(self, data):
+        self.ws.send_json(data)
+
+    def receive_json(self):
+        if not self.pending:
+            frame = self.ws.receive_json()
+            self.frames.append(frame)
+            if frame['type'] == 'batch':
+                self.pending.extend(frame['data'])
+            else:
+                self.pending.append(frame)
+        return self.pending.popleft()
+
+
+@contextmanager
+def connect(client, path):
+    """Open a WebSocket whose batch frames are unpacked."""
+    with client.websocket_connect(path) as ws:
+        yield UnbatchingSocket(ws)
 
 
 class TestRoomAPI:
@@ -92,7 +131,7 @@ class TestWebSocket:
 
     def test_websocket_connect_invalid_room(self, client):
         """Test connecting to non-existent room."""
-        with client.websocket_connect("/ws/invalid-room") as websocket:
+        with connect(client, "/ws/invalid-room") as websocket:
             data = websocket.receive_json()
             assert data['type'] == 'error'
             assert 'not found' in data['data']['message'].lower()
@@ -103,7 +142,7 @@ class TestWebSocket:
         create_response = client.post("/api/rooms", json={})
         room_id = create_response.json()['room_id']
 
-        with client.websocket_connect(f"/ws/{room_id}") as websocket:
+        with connect(client, f"/ws/{room_id}") as websocket:
             # First, spectate to see the room
             websocket.send_json({
                 "type": "spectate",
@@ -145,7 +184,7 @@ class TestWebSocket:
         create_response = client.post("/api/rooms", json={})
         room_id = create_response.json()['room_id']
 
-        with client.websocket_connect(f"/ws/{room_id}") as websocket:
+        with connect(client, f"/ws/{room_id}") as websocket:
             websocket.send_json({
                 "type": "join",
                 "data": {
@@ -162,7 +201,7 @@ class TestWebSocket:
         create_response = client.post("/api/rooms", json={})
         room_id = create_response.json()['room_id']
 
-        with client.websocket_connect(f"/ws/{room_id}") as websocket:
+        with connect(client, f"/ws/{room_id}") as websocket:
             # Spectate first
             websocket.send_json({
                 "type": "spectate",
@@ -191,7 +230,7 @@ class TestWebSocket:
         create_response = client.post("/api/rooms", json={})
         room_id = create_response.json()['room_id']
 
-        with client.websocket_connect(f"/ws/{room_id}") as websocket:
+        with connect(client, f"/ws/{room_id}") as websocket:
             # Spectate first
             websocket.send_json({
                 "type": "spectate",
@@ -220,6 +259,74 @@ class TestWebSocket:
             assert data['data']['player_name'] == 'Chatter'
             assert data['data']['message'] == 'Hello!'
 
+    @pytest.mark.asyncio
+    async def test_slow_client_is_dropped(self, monkeypatch):
+        """Test that a client whose outbox overflows is closed with 1008."""
+        import config
+        from main import open_outbox, send_to
+
+        class FakeSocket:
+            def __init__(self):
+                self.sent = []
+                self.close_code = None
+
+            async def send_text(self, text):
+                self.sent.append(text)
+
+            async def close(self, code=1000):
+                self.close_code = code
+
+        monkeypatch.setattr(config, 'WS_OUTBOX_SIZE', 2)
+        ws = FakeSocket()
+        writer = open_outbox(ws)
+
+        assert send_to(ws, {'type': 'chat', 'data': {}})
+        assert send_to(ws, {'type': 'chat', 'data': {}})
+        assert not send_to(ws, {'type': 'chat', 'data': {}})
+        await writer
+
+        assert ws.sent == []
+        assert ws.close_code == 1008
+
+
+class TestHandRecording:
+    """Tests for the batched hand-record flush."""
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_is_retried(self, test_db, monkeypatch):
+        """Test that hands survive a failed flush and are written by the next one."""
+        import main
+        from database import HistoryManager
+
+        record_hands = HistoryManager.record_hands
+        calls = []
+
+        def fail_once(hands):
+            calls.append(len(hands))
+            if len(calls) == 1:
+                raise sqlite3.OperationalError('database is locked')
+            return record_hands(hands)
+
+        monkeypatch.setattr(HistoryManager, 'record_hands', staticmethod(fail_once))
+        monkeypatch.setattr(main, 'pending_hands', [])
+        for hand_number in (1, 2):
+            main.pending_hands.append({
+                'room_id': 'retry-room',
+                'hand_number': hand_number,
+                'pot_size': 20,
+                'winners': ['Alice'],
+                'actions': [],
+                'player_results': []
+            })
+
+        await main.flush_hand_records()
+        assert len(main.pending_hands) == 2
+
+        await main.flush_hand_records()
+        assert main.pending_hands == []
+        assert calls == [2, 2]
+        assert len(HistoryManager.get_hand_history('retry-room')) == 2
+
 
 class TestMultiPlayerGame:
     """Tests for multi-player game scenarios."""
@@ -233,7 +340,7 @@ class TestMultiPlayerGame:
         room_id = create_response.json()['room_id']
 
         # Connect two players
-        with client.websocket_connect(f"/ws/{room_id}") as ws1:
+        with connect(client, f"/ws/{room_id}") as ws1:
             # Alice spectates then joins
             ws1.send_json({
                 "type": "spectate",
@@ -249,7 +356,7 @@ class TestMultiPlayerGame:
             ws1.receive_json()  # joined
             ws1.receive_json()  # game_state
 
-            with client.websocket_connect(f"/ws/{room_id}") as ws2:
+            with connect(client, f"/ws/{room_id}") as ws2:
                 # Bob spectates then joins
                 ws2.send_json({
                     "type": "spectate",
@@ -281,6 +388,54 @@ class TestMultiPlayerGame:
                 assert msg1['type'] == 'hand_started'
                 assert msg2['type'] == 'hand_started'
 
+    def test_game_state_updates_are_patches(self, client):
+        """Test that a connection gets one full state, then only changed keys."""
+        create_response = client.post("/api/rooms", json={})
+        room_id = create_response.json()['room_id']
+
+        with connect(client, f"/ws/{room_id}") as ws1:
+            ws1.send_json({"type": "spectate", "data": {"player_name": "Alice"}})
+            ws1.receive_json()  # spectating
+            ws1.receive_json()  # game_state
+            ws1.send_json({
+                "type": "join",
+                "data": {"player_name": "Alice", "stack": 100, "seat": 0}
+            })
+            ws1.receive_json()  # joined
+            full = ws1.receive_json()
+            assert full['type'] == 'game_state'
+
+            with connect(client, f"/ws/{room_id}") as ws2:
+                ws2.send_json({"type": "spectate", "data": {"player_name": "Bob"}})
+                ws2.receive_json()  # spectating
+                ws2.receive_json()  # game_state
+                ws2.send_json({
+                    "type": "join",
+                    "data": {"player_name": "Bob", "stack": 100, "seat": 1}
+                })
+                ws2.receive_json()  # joined
+                assert ws1.receive_json()['type'] == 'player_joined'
+
+                patch = ws1.receive_json()
+                assert patch['type'] == 'state_patch'
+                assert 'players' in patch['data']['set']
+                assert 'room_id' not in patch['data']['set']
+                assert patch['data']['unset'] == []
+
+    def test_queued_messages_share_a_frame(self, client):
+        """Test that messages queued together arrive as one batch frame."""
+        create_response = client.post("/api/rooms", json={})
+        room_id = create_response.json()['room_id']
+
+        with connect(client, f"/ws/{room_id}") as ws:
+            ws.send_json({"type": "spectate", "data": {"player_name": "Alice"}})
+            assert ws.receive_json()['type'] == 'spectating'
+            assert ws.receive_json()['type'] == 'game_state'
+
+            # Both were queued by one handler call, before the writer ran
+            assert len(ws.frames) == 1
+            assert ws.frames[0]['type'] == 'batch'
+
 
 class TestStatsAPI:
     """Tests for statistics API endpoints."""
@@ -2,9 +2,14 @@
 
 import os
 import pytest
+import sqlite3
 import tempfile
 from pathlib import Path
 
+import database.db as db_module
+from database import init_db, get_db, close_db, HistoryManager
+from database.db import get_db_lock
+
 
 class TestDatabase:
     """Tests for database operations."""
@@ -17,20 +22,24 @@ class TestDatabase:
         self.test_db_path = Path(self.temp_dir) / "test_berrypoker.db"
 
         # Monkeypatch the DATABASE_PATH
-        import database.db as db_module
         monkeypatch.setattr(db_module, 'DATABASE_PATH', self.test_db_path)
 
         yield
 
-        # Cleanup
+        # Cleanup - close pooled connections so WAL side files are removed
+        close_db()
         if self.test_db_path.exists():
             os.remove(self.test_db_path)
         os.rmdir(self.temp_dir)
 
+    @pytest.fixture
+    def db(self):
+        """The HistoryManager, with this test's database initialized."""
+        init_db()
+        return HistoryManager
+
     def test_init_db_creates_tables(self):
         """Test that init_db creates required tables."""
-        from database import init_db, get_db
-
         init_db()
 
         with get_db() as conn:
@@ -54,13 +63,118 @@ class TestDatabase:
             )
             assert cursor.fetchone() is not None
 
-    def test_record_hand(self):
-        """Test recording a hand to the database."""
-        from database import init_db, HistoryManager
+    def test_init_db_enables_wal(self):
+        """Test that the database runs in WAL journal mode."""
+        init_db()
 
+        with get_db() as conn:
+            mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+            assert mode == 'wal'
+
+    def test_hand_history_uses_index(self):
+        """Test that room history lookups are served by an index."""
+        init_db()
+
+        with get_db() as conn:
+            plan = conn.execute('''
+                EXPLAIN QUERY PLAN
+                SELECT id FROM hands WHERE room_id = ? ORDER BY created_at DESC LIMIT 50
+            ''', ('test-room',)).fetchall()
+            details = ' '.join(row['detail'] for row in plan)
+            assert 'idx_hands_room_created' in details
+
+    def test_leaderboard_uses_index(self):
+        """Test that the leaderboard reads players in profit order from an index."""
         init_db()
 
-        hand_id = HistoryManager.record_hand(
+        with get_db() as conn:
+            plan = conn.execute('''
+                EXPLAIN QUERY PLAN
+                SELECT player_name, hands_played, hands_won, total_profit
+                FROM player_stats ORDER BY total_profit DESC LIMIT 10
+            ''').fetchall()
+            details = ' '.join(row['detail'] for row in plan)
+            assert 'idx_stats_profit' in details
+            assert 'TEMP B-TREE' not in details
+
+    def _create_legacy_hands(self, actions: str):
+        """Create a pre-data_json hands table holding one hand."""
+        conn = sqlite3.connect(self.test_db_path)
+        conn.execute('''
+            CREATE TABLE hands (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                room_id TEXT NOT NULL,
+                hand_number INTEGER NOT NULL,
+                pot_size INTEGER NOT NULL,
+                winner_names TEXT NOT NULL,
+                actions TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        conn.execute(
+            "INSERT INTO hands (room_id, hand_number, pot_size, winner_names, actions) "
+            "VALUES ('test-room', 1, 80, 'Alice,Bob', ?)", (actions,)
+        )
+        conn.commit()
+        conn.close()
+
+    def test_init_db_migrates_legacy_hands(self):
+        """Test that comma-joined winners and actions move into data_json."""
+        self._create_legacy_hands('[]')
+
+        init_db()
+
+        details = HistoryManager.get_hand_details(1)
+        assert details['winners'] == ['Alice', 'Bob']
+        assert details['actions'] == []
+        assert 'winner_names' not in details
+
+    def test_failed_migration_is_rolled_back(self):
+        """Test that a failed migration leaves the legacy table intact."""
+        self._create_legacy_hands('not json')
+
+        with pytest.raises(ValueError):
+            init_db()
+
+        conn = sqlite3.connect(self.test_db_path)
+        tables = {row[0] for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type='table'"
+        )}
+        assert 'hands_migrated' not in tables
+        conn.execute("UPDATE hands SET actions = '[]'")
+        conn.commit()
+        conn.close()
+
+        init_db()
+
+        details = HistoryManager.get_hand_details(1)
+        assert details['winners'] == ['Alice', 'Bob']
+
+    def test_get_db_reuses_thread_connection(self):
+        """Test that get_db hands back the same pooled connection per thread."""
+        init_db()
+
+        with get_db() as first:
+            pass
+        with get_db() as second:
+            assert second is first
+
+        close_db()
+        with get_db() as third:
+            assert third is not first
+
+    def test_get_db_lock_is_deprecated_no_op(self):
+        """Test that get_db_lock warns and no longer blocks writers."""
+        with pytest.warns(DeprecationWarning):
+            lock = get_db_lock()
+
+        with lock:
+            with lock:
+                pass
+
+    def test_record_hand(self, db):
+        """Test recording a hand to the database."""
+        hand_id = db.record_hand(
             room_id='test-room',
             hand_number=1,
             pot_size=100,
@@ -92,15 +206,34 @@ class TestDatabase:
         assert hand_id is not None
         assert hand_id > 0
 
-    def test_get_hand_history(self):
-        """Test retrieving hand history."""
-        from database import init_db, HistoryManager
+    def test_record_hands_in_one_call(self, db):
+        """Test recording several hands at once returns their IDs in order."""
+        hand_ids = db.record_hands([
+            {
+                'room_id': 'bulk-room',
+                'hand_number': i + 1,
+                'pot_size': 10,
+                'winners': ['Alice'],
+                'actions': [],
+                'player_results': [
+                    {'player_name': 'Alice', 'starting_stack': 100, 'ending_stack': 105,
+                     'profit': 5, 'is_winner': True}
+                ]
+            }
+            for i in range(3)
+        ])
 
-        init_db()
+        assert len(hand_ids) == 3
+        assert hand_ids == sorted(hand_ids)
+        history = db.get_hand_history('bulk-room')
+        assert sorted(h['hand_number'] for h in history) == [1, 2, 3]
+        assert db.get_player_stats('Alice')['hands_played'] >= 3
 
+    def test_get_hand_history(self, db):
+        """Test retrieving hand history."""
         # Record a few hands
         for i in range(3):
-            HistoryManager.record_hand(
+            db.record_hand(
                 room_id='test-room',
                 hand_number=i + 1,
                 pot_size=50 + i * 10,
@@ -112,20 +245,21 @@ class TestDatabase:
                 ]
             )
 
-        history = HistoryManager.get_hand_history('test-room')
+        history = db.get_hand_history('test-room')
 
         assert len(history) == 3
         # Verify all hand numbers are present
         hand_numbers = {h['hand_number'] for h in history}
         assert hand_numbers == {1, 2, 3}
+        assert 'actions' not in history[0]
+        assert history[0]['winners'] == ['Alice']
 
-    def test_get_hand_details(self):
-        """Test retrieving detailed hand information."""
-        from database import init_db, HistoryManager
-
-        init_db()
+        history = db.get_hand_history('test-room', include_actions=True)
+        assert history[0]['actions'] == []
 
-        hand_id = HistoryManager.record_hand(
+    def test_get_hand_details(self, db):
+        """Test retrieving detailed hand information."""
+        hand_id = db.record_hand(
             room_id='test-room',
             hand_number=1,
             pot_size=100,
@@ -137,7 +271,7 @@ class TestDatabase:
             ]
         )
 
-        details = HistoryManager.get_hand_details(hand_id)
+        details = db.get_hand_details(hand_id)
 
         assert details is not None
         assert details['room_id'] == 'test-room'
@@ -145,23 +279,15 @@ class TestDatabase:
         assert len(details['actions']) == 1
         assert len(details['player_results']) == 1
 
-    def test_get_nonexistent_hand(self):
+    def test_get_nonexistent_hand(self, db):
         """Test retrieving non-existent hand returns None."""
-        from database import init_db, HistoryManager
-
-        init_db()
-
-        details = HistoryManager.get_hand_details(99999)
+        details = db.get_hand_details(99999)
         assert details is None
 
-    def test_player_stats_updated(self):
+    def test_player_stats_updated(self, db):
         """Test that player stats are updated correctly."""
-        from database import init_db, HistoryManager
-
-        init_db()
-
         # Record winning hand for Alice
-        HistoryManager.record_hand(
+        db.record_hand(
             room_id='test-room',
             hand_number=1,
             pot_size=100,
@@ -175,8 +301,8 @@ class TestDatabase:
             ]
         )
 
-        alice_stats = HistoryManager.get_player_stats('Alice')
-        bob_stats = HistoryManager.get_player_stats('Bob')
+        alice_stats = db.get_player_stats('Alice')
+        bob_stats = db.get_player_stats('Bob')
 
         assert alice_stats['hands_played'] == 1
         assert alice_stats['hands_won'] == 1
@@ -186,59 +312,47 @@ class TestDatabase:
         assert bob_stats['hands_won'] == 0
         assert bob_stats['total_profit'] == -50
 
-    def test_player_stats_accumulate(self):
+    def test_player_stats_accumulate(self, db):
         """Test that stats accumulate across multiple hands."""
-        from database import init_db, HistoryManager
-
-        init_db()
-
-        # Alice wins first hand
-        HistoryManager.record_hand(
-            room_id='test-room',
-            hand_number=1,
-            pot_size=100,
-            winners=['Alice'],
-            actions=[],
-            player_results=[
-                {'player_name': 'Alice', 'starting_stack': 100, 'ending_stack': 150,
-                 'profit': 50, 'is_winner': True}
-            ]
-        )
-
-        # Alice wins second hand
-        HistoryManager.record_hand(
-            room_id='test-room',
-            hand_number=2,
-            pot_size=200,
-            winners=['Alice'],
-            actions=[],
-            player_results=[
-                {'player_name': 'Alice', 'starting_stack': 150, 'ending_stack': 250,
-                 'profit': 100, 'is_winner': True}
-            ]
-        )
+        # Alice wins both hands, recorded in one transaction
+        db.record_hands([
+            {
+                'room_id': 'test-room',
+                'hand_number': 1,
+                'pot_size': 100,
+                'winners': ['Alice'],
+                'actions': [],
+                'player_results': [
+                    {'player_name': 'Alice', 'starting_stack': 100, 'ending_stack': 150,
+                     'profit': 50, 'is_winner': True}
+                ]
+            },
+            {
+                'room_id': 'test-room',
+                'hand_number': 2,
+                'pot_size': 200,
+                'winners': ['Alice'],
+                'actions': [],
+                'player_results': [
+                    {'player_name': 'Alice', 'starting_stack': 150, 'ending_stack': 250,
+                     'profit': 100, 'is_winner': True}
+                ]
+            }
+        ])
 
-        stats = HistoryManager.get_player_stats('Alice')
+        stats = db.get_player_stats('Alice')
 
         assert stats['hands_played'] == 2
         assert stats['hands_won'] == 2
         assert stats['total_profit'] == 150
 
-    def test_get_nonexistent_player_stats(self):
+    def test_get_nonexistent_player_stats(self, db):
         """Test retrieving stats for non-existent player."""
-        from database import init_db, HistoryManager
-
-        init_db()
-
-        stats = HistoryManager.get_player_stats('Ghost')
+        stats = db.get_player_stats('Ghost')
         assert stats is None
 
-    def test_get_leaderboard(self):
+    def test_get_leaderboard(self, db):
         """Test getting leaderboard."""
-        from database import init_db, HistoryManager
-
-        init_db()
-
         # Create some players with different profits
         players = [
             ('Alice', 100),
@@ -247,35 +361,33 @@ class TestDatabase:
             ('Diana', 50)
         ]
 
-        for name, profit in players:
-            HistoryManager.record_hand(
-                room_id='test-room',
-                hand_number=1,
-                pot_size=100,
-                winners=[name] if profit > 0 else [],
-                actions=[],
-                player_results=[
+        db.record_hands([
+            {
+                'room_id': 'test-room',
+                'hand_number': 1,
+                'pot_size': 100,
+                'winners': [name] if profit > 0 else [],
+                'actions': [],
+                'player_results': [
                     {'player_name': name, 'starting_stack': 100,
                      'ending_stack': 100 + profit, 'profit': profit,
                      'is_winner': profit > 0}
                 ]
-            )
+            }
+            for name, profit in players
+        ])
 
-        leaderboard = HistoryManager.get_leaderboard(limit=3)
+        leaderboard = db.get_leaderboard(limit=3)
 
         assert len(leaderboard) == 3
         # Should be sorted by profit descending
         assert leaderboard[0]['player_name'] == 'Charlie'
         assert leaderboard[0]['total_profit'] == 200
 
-    def test_get_all_stats(self):
+    def test_get_all_stats(self, db):
         """Test getting all player stats."""
-        from database import init_db, HistoryManager
-
-        init_db()
-
         # Record hands for multiple players
-        HistoryManager.record_hand(
+        db.record_hand(
             room_id='test-room',
             hand_number=1,
             pot_size=100,
@@ -289,7 +401,7 @@ class TestDatabase:
             ]
         )
 
-        all_stats = HistoryManager.get_all_stats()
+        all_stats = db.get_all_stats()
 
         assert len(all_stats) == 2
         names = [s['player_name'] for s in all_stats]
@@ -5,6 +5,35 @@ from game.poker import Card
 from game.hand_evaluator import HandEvaluator, HandRank
 
 
+def _cards(*codes):
+    return [Card(rank, suit) for rank, suit in codes]
+
+
+# One five-card hand of each type, weakest first
+HAND_CASES = [
+    ("high_card", _cards(('A', 'hearts'), ('K', 'diamonds'), ('J', 'clubs'),
+                         ('9', 'spades'), ('7', 'hearts')), HandRank.HIGH_CARD),
+    ("pair", _cards(('A', 'hearts'), ('A', 'diamonds'), ('J', 'clubs'),
+                    ('9', 'spades'), ('7', 'hearts')), HandRank.PAIR),
+    ("two_pair", _cards(('A', 'hearts'), ('A', 'diamonds'), ('J', 'clubs'),
+                        ('J', 'spades'), ('7', 'hearts')), HandRank.TWO_PAIR),
+    ("trips", _cards(('A', 'hearts'), ('A', 'diamonds'), ('A', 'clubs'),
+                     ('9', 'spades'), ('7', 'hearts')), HandRank.THREE_OF_A_KIND),
+    ("straight", _cards(('9', 'hearts'), ('8', 'diamonds'), ('7', 'clubs'),
+                        ('6', 'spades'), ('5', 'hearts')), HandRank.STRAIGHT),
+    ("flush", _cards(('A', 'hearts'), ('K', 'hearts'), ('J', 'hearts'),
+                     ('9', 'hearts'), ('2', 'hearts')), HandRank.FLUSH),
+    ("full_house", _cards(('A', 'hearts'), ('A', 'diamonds'), ('A', 'clubs'),
+                          ('K', 'spades'), ('K', 'hearts')), HandRank.FULL_HOUSE),
+    ("quads", _cards(('A', 'hearts'), ('A', 'diamonds'), ('A', 'clubs'),
+                     ('A', 'spades'), ('7', 'hearts')), HandRank.FOUR_OF_A_KIND),
+    ("straight_flush", _cards(('9', 'hearts'), ('8', 'hearts'), ('7', 'hearts'),
+                              ('6', 'hearts'), ('5', 'hearts')), HandRank.STRAIGHT_FLUSH),
+    ("royal_flush", _cards(('A', 'hearts'), ('K', 'hearts'), ('Q', 'hearts'),
+                           ('J', 'hearts'), ('10', 'hearts')), HandRank.ROYAL_FLUSH),
+]
+
+
 class TestHandEvaluator:
     """Tests for the HandEvaluator class."""
 
@@ -209,35 +238,89 @@ class TestHandEvaluator:
         ])
         assert winners == [0, 1]  # Both tie
 
+    @pytest.mark.parametrize("cards,expected", [case[1:] for case in HAND_CASES],
+                             ids=[case[0] for case in HAND_CASES])
+    def test_hand_rank(self, cards, expected):
+        """Test that one hand of each type gets its rank."""
+        assert HandEvaluator.evaluate(cards)[0] == expected
+
     def test_hand_ranking_order(self):
         """Test that hand rankings are in correct order."""
-        # Create one hand of each type and verify ordering
-        high_card = [Card('A', 'hearts'), Card('K', 'diamonds'), Card('J', 'clubs'),
-                     Card('9', 'spades'), Card('7', 'hearts')]
-        pair = [Card('A', 'hearts'), Card('A', 'diamonds'), Card('J', 'clubs'),
-                Card('9', 'spades'), Card('7', 'hearts')]
-        two_pair = [Card('A', 'hearts'), Card('A', 'diamonds'), Card('J', 'clubs'),
-                    Card('J', 'spades'), Card('7', 'hearts')]
-        trips = [Card('A', 'hearts'), Card('A', 'diamonds'), Card('A', 'clubs'),
-                 Card('9', 'spades'), Card('7', 'hearts')]
-        straight = [Card('9', 'hearts'), Card('8', 'diamonds'), Card('7', 'clubs'),
-                    Card('6', 'spades'), Card('5', 'hearts')]
-        flush = [Card('A', 'hearts'), Card('K', 'hearts'), Card('J', 'hearts'),
-                 Card('9', 'hearts'), Card('2', 'hearts')]
-        full_house = [Card('A', 'hearts'), Card('A', 'diamonds'), Card('A', 'clubs'),
-                      Card('K', 'spades'), Card('K', 'hearts')]
-        quads = [Card('A', 'hearts'), Card('A', 'diamonds'), Card('A', 'clubs'),
-                 Card('A', 'spades'), Card('7', 'hearts')]
-        straight_flush = [Card('9', 'hearts'), Card('8', 'hearts'), Card('7', 'hearts'),
-                          Card('6', 'hearts'), Card('5', 'hearts')]
-        royal_flush = [Card('A', 'hearts'), Card('K', 'hearts'), Card('Q', 'hearts'),
-                       Card('J', 'hearts'), Card('10', 'hearts')]
-
-        hands = [high_card, pair, two_pair, trips, straight, flush,
-                 full_house, quads, straight_flush, royal_flush]
-
-        ranks = [HandEvaluator.evaluate(h)[0] for h in hands]
-
-        # Verify each hand ranks higher than the previous
-        for i in range(1, len(ranks)):
-            assert ranks[i] > ranks[i-1], f"Hand {i} should rank higher than hand {i-1}"
+        ranks = [expected for _, _, expected in HAND_CASES]
+        assert ranks == sorted(ranks)
+        assert len(set(ranks)) == len(ranks)
+
+    def test_best_hand_full_house_from_two_trips(self):
+        """Test that two sets of trips make the highest full house."""
+        hole_cards = [Card('9', 'hearts'), Card('9', 'diamonds')]
+        community = [
+            Card('9', 'clubs'),
+            Card('K', 'hearts'),
+            Card('K', 'spades'),
+            Card('K', 'clubs'),
+            Card('2', 'diamonds')
+        ]
+        best_cards, rank, tiebreakers, desc = HandEvaluator.best_hand(hole_cards, community)
+        assert rank == HandRank.FULL_HOUSE
+        assert tiebreakers == [13, 9]
+        assert sorted(c.value for c in best_cards) == [9, 9, 13, 13, 13]
+
+    def test_eval7_orders_hands(self):
+        """Test that eval7 scores compare like (rank, tiebreakers)."""
+        community = [
+            Card('5', 'clubs'),
+            Card('7', 'spades'),
+            Card('9', 'hearts'),
+            Card('2', 'clubs'),
+            Card('3', 'diamonds')
+        ]
+        aces = HandEvaluator.eval7([Card('A', 'hearts'), Card('A', 'diamonds')] + community)
+        kings = HandEvaluator.eval7([Card('K', 'hearts'), Card('K', 'diamonds')] + community)
+        wheel = HandEvaluator.eval7([Card('A', 'clubs'), Card('4', 'hearts')] + community)
+        assert wheel > aces > kings
+
+    def test_eval7_batch_matches_eval7(self):
+        """Test that batch scoring agrees with scoring hands one at a time."""
+        community = [Card('Q', 'hearts'), Card('J', 'hearts'), Card('10', 'hearts'),
+                     Card('2', 'clubs'), Card('2', 'diamonds')]
+        hands = [
+            [Card('A', 'hearts'), Card('K', 'hearts')] + community,
+            [Card('2', 'hearts'), Card('2', 'spades')] + community,
+            [Card('3', 'clubs'), Card('4', 'spades')] + community
+        ]
+        assert HandEvaluator.eval7_batch(hands) == [HandEvaluator.eval7(h) for h in hands]
+
+    def test_evaluation_ignores_card_order(self):
+        """Test that cached results are shared by any ordering of the same cards."""
+        cards = [Card('A', 'spades'), Card('A', 'hearts'), Card('K', 'clubs'),
+                 Card('K', 'diamonds'), Card('7', 'spades'), Card('3', 'clubs'), Card('2', 'hearts')]
+        first = HandEvaluator.best_hand(cards[:2], cards[2:])
+        second = HandEvaluator.best_hand(cards[5:], cards[:5][::-1])
+
+        assert first[1:] == second[1:]
+        assert set(first[0]) == set(second[0])
+
+    def test_eval7_requires_five_to_seven_cards(self):
+        """Test that eval7 and compare_hands reject too few or too many cards."""
+        with pytest.raises(ValueError, match="5 to 7 cards"):
+            HandEvaluator.eval7([Card('A', 'hearts')])
+
+        eight = [Card(rank, 'hearts') for rank in ['2', '3', '4', '5', '6', '7', '8', '9']]
+        with pytest.raises(ValueError, match="5 to 7 cards"):
+            HandEvaluator.eval7(eight)
+
+        with pytest.raises(ValueError):
+            HandEvaluator.compare_hands([
+                ([Card('A', 'hearts'), Card('A', 'diamonds')], []),
+                ([Card('K', 'hearts'), Card('2', 'clubs')], [])
+            ])
+
+    def test_best_hand_with_community_key(self):
+        """Test that a precomputed community key gives the same result."""
+        community = [Card('K', 'hearts'), Card('K', 'spades'), Card('7', 'clubs'),
+                     Card('4', 'diamonds'), Card('2', 'hearts')]
+        key = HandEvaluator.community_key(community)
+        for hole in ([Card('A', 'hearts'), Card('K', 'clubs')],
+                     [Card('7', 'hearts'), Card('7', 'spades')]):
+            assert HandEvaluator.best_hand(hole, community, key) == \
+                HandEvaluator.best_hand(hole, community)
@@ -37,6 +37,14 @@ class TestCard:
         card = Card('K', 'spades')
         d = card.to_dict()
         assert d == {'rank': 'K', 'suit': 'spades'}
+        assert Card('K', 'spades').to_dict() is d
+
+    def test_card_is_shared_instance(self):
+        """Test that equal cards are the same flyweight instance."""
+        card = Card('K', 'spades')
+        assert Card('K', 'spades') is card
+        assert Card.from_dict(card.to_dict()) is card
+        assert Card.from_code(card.code) is card
 
     def test_card_from_dict(self):
         """Test card deserialization from dict."""
@@ -59,6 +67,13 @@ class TestCard:
         assert card1 == card2
         assert card1 != card3
 
+    def test_card_code_round_trip(self):
+        """Test that cards round-trip through their packed code."""
+        for code in range(52):
+            card = Card.from_code(code)
+            assert Card(card.rank, card.suit) == card
+            assert card.code == code
+
     def test_card_hash(self):
         """Test card hashing for use in sets/dicts."""
         card1 = Card('A', 'hearts')
@@ -104,6 +119,23 @@ class TestDeck:
         for card in cards:
             assert isinstance(card, Card)
 
+    def test_deck_deals_from_top(self):
+        """Test that dealt cards come off the top of the deck in order."""
+        deck = Deck()
+        top = deck.cards[-3:]
+        assert deck.deal(3) == top
+        assert deck.cards[-1] is not top[-1]
+        next_card = deck.cards[-1]
+        assert deck.deal_one() is next_card
+
+    def test_deck_sample_leaves_deck_intact(self):
+        """Test that sampling draws distinct cards without dealing them."""
+        deck = Deck()
+        cards = deck.sample(7)
+        assert len(set(cards)) == 7
+        assert all(card in deck.cards for card in cards)
+        assert len(deck) == 52
+
     def test_deck_deal_too_many(self):
         """Test that dealing too many cards raises error."""
         deck = Deck()
@@ -119,16 +151,13 @@ class TestDeck:
         assert len(deck) == 52
 
     def test_deck_shuffle_changes_order(self):
-        """Test that shuffle changes card order."""
-        deck1 = Deck()
-        deck2 = Deck()
-
-        # Get order before shuffle
-        order1 = [(c.rank, c.suit) for c in deck1.cards]
-        deck2.shuffle()
-        order2 = [(c.rank, c.suit) for c in deck2.cards]
-
-        # Orders should be different (extremely unlikely to be same)
-        # Note: Deck() constructor already shuffles, so we compare two shuffled decks
-        # They should be different with very high probability
-        assert order1 != order2 or True  # Allow for extremely rare case
+        """Test that shuffle reorders the same 52 cards."""
+        deck = Deck()
+
+        before = [(c.rank, c.suit) for c in deck.cards]
+        deck.shuffle()
+        after = [(c.rank, c.suit) for c in deck.cards]
+
+        # A shuffle reproduces the previous order with probability 1/52!
+        assert after != before
+        assert sorted(after) == sorted(before)
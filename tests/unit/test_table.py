@@ -54,6 +54,15 @@ class TestPlayer:
         assert 'hole_cards' in d
         assert len(d['hole_cards']) == 2
 
+    def test_player_from_dict_round_trip(self):
+        """Test that from_dict restores a player from its full dict."""
+        from game.poker import Card
+        player = Player(name="Bob", seat=1, stack=150, current_bet=20, total_bet=50,
+                        is_all_in=False, is_folded=True)
+        player.hole_cards = [Card('A', 'hearts'), Card('K', 'spades')]
+
+        assert Player.from_dict(player.to_dict(show_cards=True)) == player
+
 
 class TestPot:
     """Tests for the Pot class."""
@@ -71,6 +80,14 @@ class TestPot:
         assert d['amount'] == 50
         assert d['eligible_players'] == ['Alice']
 
+    def test_pot_from_dict_builds_seat_mask(self):
+        """Test that eligible names are mapped to seat bits."""
+        pot = Pot.from_dict({'amount': 80, 'eligible_players': ['Alice', 'Bob']},
+                            {'Alice': 0, 'Bob': 3, 'Carol': 5})
+        assert pot.amount == 80
+        assert pot.eligible_players == ['Alice', 'Bob']
+        assert pot.eligible_mask == 0b1001
+
 
 class TestTable:
     """Tests for the Table class."""
@@ -111,6 +128,25 @@ class TestTable:
         assert player2 is None
         assert len(table.players) == 1
 
+    def test_add_player_invalid_seat(self):
+        """Test adding player to a seat outside the table returns None."""
+        table = Table('test-room')
+
+        assert table.add_player('Alice', 100, seat=9) is None
+        assert table.add_player('Bob', 100, seat=-1) is None
+        assert len(table.players) == 0
+
+    def test_seats_stay_in_clockwise_order(self):
+        """Test that occupied seats are kept sorted as players join and leave."""
+        table = Table('test-room')
+        for name, seat in [('Alice', 6), ('Bob', 2), ('Carol', 8), ('Dave', 0)]:
+            table.add_player(name, 100, seat=seat)
+        table.remove_player('Carol')
+
+        assert table.players.keys() == [0, 2, 6]
+        assert [p.name for p in table.players.values()] == ['Dave', 'Bob', 'Alice']
+        assert table._get_next_seat(6, skip_folded=False) == 0
+
     def test_add_player_table_full(self):
         """Test adding player to full table returns None."""
         table = Table('test-room')
@@ -142,6 +178,20 @@ class TestTable:
         assert len(table.players) == 1
         assert table.get_player_by_name('Alice') is None
 
+    def test_get_player_by_name_follows_seat_changes(self):
+        """Test that name lookups track players joining, leaving and reseating."""
+        table = Table('test-room')
+        table.add_player('Alice', 100, seat=4)
+        table.add_player('Bob', 100, seat=1)
+
+        assert table.get_player_by_name('Alice').seat == 4
+        table.remove_player('Alice')
+        assert table.get_player_by_name('Alice') is None
+
+        table.add_player('Alice', 100, seat=7)
+        assert table.get_player_by_name('Alice').seat == 7
+        assert table.get_player_by_name('Bob').seat == 1
+
     def test_remove_nonexistent_player(self):
         """Test removing non-existent player returns False."""
         table = Table('test-room')
@@ -248,12 +298,45 @@ class TestTable:
         # Should include valid actions for Alice if it's her turn
         assert 'valid_actions' in state
 
+    def test_personalize_state_only_adds_own_cards(self):
+        """Test that a personalized state shows only that player's cards."""
+        table = Table('test-room')
+        table.add_player('Alice', 100, seat=0)
+        table.add_player('Bob', 100, seat=1)
+        table.start_hand()
+
+        public = table.get_game_state()
+        state = table.personalize_state(public, 'Alice')
+
+        alice, bob = state['players']
+        assert len(alice['hole_cards']) == 2
+        assert 'hole_cards' not in bob
+        assert bob is public['players'][1]
+        assert 'hole_cards' not in public['players'][0]
+        assert 'valid_actions' not in public
+        assert state == table.get_game_state(for_player='Alice')
+
     def test_pot_property(self):
         """Test that pot property returns sum of all pots."""
         table = Table('test-room')
         table.pots = [Pot(amount=50), Pot(amount=30), Pot(amount=20)]
         assert table.pot == 100
 
+    def test_serialize_round_trip_keeps_cards(self):
+        """Test that a restored table has the same cards and pots."""
+        table = Table('test-room')
+        table.add_player('Alice', 100, seat=0)
+        table.add_player('Bob', 100, seat=3)
+        table.start_hand()
+        table.process_action(table.players[table.current_player_seat].name, 'call')
+        table.process_action(table.players[table.current_player_seat].name, 'check')
+        assert len(table.community_cards) == 3
+
+        restored = Table.deserialize(table.serialize())
+        assert restored.community_cards == table.community_cards
+        assert restored.players[3].hole_cards == table.players[3].hole_cards
+        assert restored.pots[0].eligible_mask == table.pots[0].eligible_mask
+
 
 class TestHeadsUpRules:
     """Tests for heads-up (2 player) specific rules."""
@@ -320,6 +403,35 @@ class TestThreePlayerRules:
         # Current player should be seat 0 (UTG)
         assert table.current_player_seat == 0
 
+    def test_blind_all_in_keeps_three_handed_order(self):
+        """A blind going all-in doesn't turn the hand heads-up or skip their cards."""
+        table = Table('test-room', small_blind=1, big_blind=2, min_buy_in=1)
+        table.add_player('Alice', 100, seat=0)  # Dealer
+        table.add_player('Bob', 1, seat=1)      # SB, all-in posting the blind
+        table.add_player('Charlie', 100, seat=2)  # BB
+
+        table.start_hand()
+
+        assert table.players[1].is_all_in
+        assert len(table.players[1].hole_cards) == 2
+        assert not table._is_heads_up()
+        assert table._get_bb_seat() == 2
+        assert table.current_player_seat == 0
+
+    def test_blind_seats_fixed_for_hand(self):
+        """Blind seats are computed once when blinds are posted."""
+        table = Table('test-room', small_blind=1, big_blind=2)
+        table.add_player('Alice', 100, seat=0)  # Dealer
+        table.add_player('Bob', 100, seat=1)    # SB
+        table.add_player('Charlie', 100, seat=2)  # BB
+
+        table.start_hand()
+
+        assert (table._sb_seat, table._bb_seat) == (1, 2)
+        table.dealer_seat = 1  # Later lookups don't walk the ring again
+        assert table._get_sb_seat() == 1
+        assert table._get_bb_seat() == 2
+
     def test_three_player_postflop_sb_acts_first(self):
         """In 3+ player game postflop, first active player left of button acts first."""
         table = Table('test-room', small_blind=1, big_blind=2)
@@ -376,6 +488,21 @@ class TestMinRaiseRules:
         assert result['success'] is True
         assert table.players[1].is_all_in is True
 
+    def test_short_all_in_reaches_aggressor_unmatched(self):
+        """A short all-in doesn't close the round when action returns to the raiser."""
+        table = Table('test-room', small_blind=1, big_blind=2, min_buy_in=1)
+        table.add_player('Alice', 100, seat=0)  # Dealer, UTG
+        table.add_player('Bob', 12, seat=1)     # SB
+        table.add_player('Charlie', 100, seat=2)  # BB
+
+        table.start_hand()
+        table.process_action('Alice', 'raise', 10)
+        table.process_action('Bob', 'all_in')  # To 12, not a full raise
+        table.process_action('Charlie', 'call')
+
+        assert table.phase == GamePhase.PREFLOP
+        assert table.current_player_seat == 0
+
 
 class TestSidePots:
     """Tests for side pot calculations."""
@@ -463,6 +590,29 @@ class TestAllInResponse:
         assert table.phase == GamePhase.WAITING
         assert len(table.community_cards) == 5
 
+    def test_run_it_twice_deals_two_distinct_boards(self):
+        """Running it twice deals each board from the undealt cards, with no card reused."""
+        table = Table('test-room', small_blind=1, big_blind=2)
+        table.add_player('Alice', 100, seat=0)
+        table.add_player('Bob', 100, seat=1)
+
+        table.start_hand()
+        table.process_action('Alice', 'all_in')
+        table.process_action('Bob', 'call')
+
+        table.process_run_twice_choice('Alice', True)
+        table.process_run_twice_choice('Bob', True)
+
+        result = table._last_hand_result
+        assert result['run_twice'] is True
+        first = {(c['rank'], c['suit']) for c in result['first_run']['community']}
+        second = {(c['rank'], c['suit']) for c in result['second_run']['community']}
+        hole = {(c.rank, c.suit) for p in table.players.values() for c in p.hole_cards}
+        assert len(first) == len(second) == 5
+        assert not first & second
+        assert not (first | second) & hole
+        assert sum(p.stack for p in table.players.values()) == 200
+
     def test_three_player_all_in_others_can_respond(self):
         """In 3-way pot, all-in should let others respond."""
         table = Table('test-room', small_blind=1, big_blind=2)
@@ -562,7 +712,24 @@ class TestTableActions:
 
         history = self.table.get_action_history()
         assert len(history) > 0
-        assert history[-1]['player'] == current_player.name
+        assert history[-1] == {
+            'player': current_player.name, 'action': 'call',
+            'amount': history[-1]['amount'], 'phase': 'preflop'
+        }
+
+    def test_action_history_tracks_new_actions_and_hands(self):
+        """Test that the cached history picks up new actions and resets per hand."""
+        first = self.table.players[self.table.current_player_seat]
+        self.table.process_action(first.name, 'call')
+        assert len(self.table.get_action_history()) == 1
+
+        second = self.table.players[self.table.current_player_seat]
+        self.table.process_action(second.name, 'fold')
+        history = self.table.get_action_history()
+        assert [a['player'] for a in history] == [first.name, second.name]
+
+        self.table.action_history = []
+        assert self.table.get_action_history() == []
 
     def test_game_advances_after_all_fold(self):
         """Test game ends when all but one player folds."""
@@ -654,6 +821,20 @@ class TestPositionNames:
         assert 'CO' in position_values
         assert 'HJ' in position_values
 
+    def test_positions_follow_sitting_out(self):
+        """Test that positions are recomputed when a player sits out."""
+        table = Table('test-room')
+        table.add_player('Alice', 100, seat=0)
+        table.add_player('Bob', 100, seat=1)
+        table.add_player('Charlie', 100, seat=2)
+        table.start_hand()
+        assert table.get_position_name(2) == 'BB'
+
+        table.players[1].is_sitting_out = True
+        assert table.get_position_name(1) == ''
+        assert table.get_position_name(2) == 'BB'
+        assert table.get_position_name(0) == 'BTN'
+
 
 class TestBBOption:
     """Tests for big blind option."""